@@ -0,0 +1,259 @@
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from control.formulae import init_vectors, init_vectors_batch, transform_vector
+from control.optimization import (get_bounds, findStartingValue, constraints, objective, objective_jac,
+                                  ineq_constraints, ineq_constraints_batch, setOptimizationResults)
+from control.simulation import simulate
+from control.validation import validate
+from model.variables import SimulationContext
+
+"""
+Times the hot paths of the program across a range of input sizes and writes the results to a JSON file. The results
+are compared against the committed baseline, and every case that got more than TOLERANCE times slower is reported.
+The script exits with -1 if there is such a regression.
+
+Usage: python benchmark.py [baseline] (from src/benchmark, with src on the Python path like main.py)
+With "baseline", the results are written to the baseline file instead, e.g. after an intended change of performance.
+"""
+
+# files of the results and the baseline, relative to this directory
+RESULT_FILE = "benchmarkResults.json"
+BASELINE_FILE = "baseline.json"
+# factor a case may be slower than the baseline before it counts as a regression
+TOLERANCE = 2.0
+# number of measurements per case and size, the fastest one counts
+REPEATS = 5
+# minimum time of one measurement (in s)
+MIN_TIME = 0.05
+# seed of the random numbers, so every run measures the same work
+SEED = 1
+# optimized parameters the cases are evaluated at
+X = np.array([27.0, 800.0, 0.51, 0.3, 2.5, 960.0])
+
+
+def get_context():
+    """
+    Creates the scenario of the benchmark from the configuration file. Caching and warm starts are switched off, so
+    every optimization does the full work, and the views are not shown.
+
+    Returns:
+        SimulationContext: The validated scenario.
+    """
+    context = SimulationContext()
+    with contextlib.redirect_stdout(io.StringIO()):
+        validate(context)
+    context.useCache = False
+    context.warmStartNeighbours = 0
+    context.startingValueWorkers = 1
+    context.randomSeed = SEED
+    return context
+
+
+def set_results(context):
+    """
+    Sets fixed optimized parameters and their force vectors to the scenario, as needed for simulating it.
+
+    Parameters:
+        context (SimulationContext): The scenario.
+
+    Returns:
+        None
+    """
+    setOptimizationResults(*X, context)
+
+
+def measure(function):
+    """
+    Times a function like timeit: it is called in loops that take at least MIN_TIME, so fast functions are not
+    dominated by the noise of the timer, and the fastest of REPEATS loops counts.
+
+    Parameters:
+        function (callable): The function to time, without parameters.
+
+    Returns:
+        float: The fastest time of a single call (in s).
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        calls = 1
+        while True:  # find the number of calls per loop
+            start = time.perf_counter()
+            for _ in range(calls):
+                function()
+            if time.perf_counter() - start >= MIN_TIME:
+                break
+            calls *= 2
+
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            for _ in range(calls):
+                function()
+            times.append((time.perf_counter() - start) / calls)
+    return min(times)
+
+
+def benchmark_init_vectors(context, calls):
+    """
+    Builds the force vectors `calls` times in a row.
+    """
+    args = (*X[[0, 1, 3, 4, 5]], context.gasContent, context.temperature, context.velocity, context.turnAngle,
+            context.gravityAcceleration)
+    return measure(lambda: [init_vectors(*args) for _ in range(calls)])
+
+
+def benchmark_init_vectors_batch(context, samples):
+    """
+    Builds the force vectors of `samples` parameter sets at once.
+    """
+    x = np.tile(X, (samples, 1))
+    return measure(lambda: init_vectors_batch(x, context.gasContent, context.temperature, context.velocity,
+                                              context.turnAngle, context.gravityAcceleration))
+
+
+def benchmark_transform_vector(context, vectors):
+    """
+    Rotates `vectors` vectors by one angle each.
+    """
+    vector = np.random.default_rng(SEED).normal(size=(vectors, 3))
+    angles = np.linspace(0, np.pi / 2, vectors)
+    return measure(lambda: transform_vector(vector, 0, angles, 0))
+
+
+def benchmark_ineq_constraints(context, calls):
+    """
+    Evaluates the inequality constraints `calls` times in a row.
+    """
+    return measure(lambda: [ineq_constraints(X, context) for _ in range(calls)])
+
+
+def benchmark_ineq_constraints_batch(context, samples):
+    """
+    Evaluates the inequality constraints of `samples` parameter sets at once.
+    """
+    x = np.tile(X, (samples, 1))
+    return measure(lambda: ineq_constraints_batch(x, context))
+
+
+def benchmark_slsqp_solve(context, size):
+    """
+    Runs one SLSQP solve from a fixed starting value.
+    """
+    from scipy.optimize import minimize
+    bounds = get_bounds(context.CONSTRAINTS)
+    return measure(lambda: minimize(objective, X, args=(context,), method="SLSQP", jac=objective_jac, bounds=bounds,
+                                    constraints=constraints(context)))
+
+
+def benchmark_find_starting_value(context, size):
+    """
+    Searches a starting value with the fixed seed.
+    """
+    bounds = get_bounds(context.CONSTRAINTS)
+    return measure(lambda: findStartingValue(bounds, context))
+
+
+def benchmark_simulate(context, simulationIterations):
+    """
+    Simulates the curve in `simulationIterations` steps.
+    """
+    set_results(context)
+    context.simulationIterations = simulationIterations
+    return measure(lambda: simulate(context))
+
+
+def benchmark_render_views(context, simulationIterations):
+    """
+    Renders both views off-screen for a trajectory of `simulationIterations` steps.
+    """
+    from view.wholeView import render_views, create_figure
+    set_results(context)
+    context.simulationIterations = simulationIterations
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulate(context)
+    figure = create_figure()
+    return measure(lambda: render_views(context.trajectory, len(context.trajectory) // 2, context, io.BytesIO(),
+                                        figure))
+
+
+# cases of the benchmark with the input sizes they are measured at
+CASES = {
+    'init_vectors': (benchmark_init_vectors, [1, 100, 1000]),
+    'init_vectors_batch': (benchmark_init_vectors_batch, [100, 10000]),
+    'transform_vector': (benchmark_transform_vector, [1, 1000, 100000]),
+    'ineq_constraints': (benchmark_ineq_constraints, [1, 100, 1000]),
+    'ineq_constraints_batch': (benchmark_ineq_constraints_batch, [100, 10000]),
+    'slsqp_solve': (benchmark_slsqp_solve, [1]),
+    'findStartingValue': (benchmark_find_starting_value, [1]),
+    'simulate': (benchmark_simulate, [1000, 100000, 1000000]),
+    'render_views': (benchmark_render_views, [1000, 100000]),
+}
+
+
+def run_benchmark():
+    """
+    Measures all cases at all of their sizes.
+
+    Returns:
+        dict: The machine the benchmark ran on and the time of every case and size (in s).
+    """
+    results = {}
+    for name, (function, sizes) in CASES.items():
+        results[name] = {}
+        for size in sizes:
+            results[name][str(size)] = function(get_context(), size)
+            print(f"\t{name} [{size}]: {results[name][str(size)] * 1000:.3f} ms")
+
+    return {'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                        'platform': platform.platform(), 'processor': platform.processor()},
+            'results': results}
+
+
+def compare(results, baseline):
+    """
+    Compares the results with the baseline and prints every case and size that got slower than the tolerance allows.
+
+    Parameters:
+        results (dict): The results of this run.
+        baseline (dict): The results of the baseline.
+
+    Returns:
+        bool: True if there is a regression, False otherwise.
+    """
+    regression = False
+    for name, sizes in results['results'].items():
+        for size, seconds in sizes.items():
+            reference = baseline['results'].get(name, {}).get(size)
+            if reference is not None and seconds > reference * TOLERANCE:
+                print(f"\tRegression: {name} [{size}] takes {seconds / reference:.2f} times as long as the baseline.")
+                regression = True
+    return regression
+
+
+if __name__ == '__main__':
+    directory = os.path.dirname(os.path.abspath(__file__))
+    writeBaseline = len(sys.argv) == 2 and sys.argv[1] == "baseline"
+
+    print("Running benchmark...")
+    results = run_benchmark()
+
+    path = os.path.join(directory, BASELINE_FILE if writeBaseline else RESULT_FILE)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"Results written to {path}.")
+
+    if not writeBaseline:
+        with open(os.path.join(directory, BASELINE_FILE), 'r') as f:
+            baseline = json.load(f)
+        if baseline['machine'] != results['machine']:
+            print("\tThe baseline was measured on another machine, the comparison is only indicative.")
+        if compare(results, baseline):
+            exit(-1)
+        print("No regressions.")
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+"""
+Measures how long it takes to import the entry points of the program, using the -X importtime option of Python.
+Heavy dependencies must only be loaded by the stages that need them, so importing an entry point must not load any of
+HEAVY_MODULES. The script exits with -1 if it does, or if an entry point takes longer than IMPORT_BUDGET to import, so
+regressions of the startup time are caught.
+
+Usage: python importTime.py
+"""
+
+# modules that are imported before anything runs
+ENTRY_POINTS = ('control.main', 'control.replay', 'control.sweep', 'control.batch')
+# packages that must only be imported by the stage that needs them
+HEAVY_MODULES = ('scipy', 'matplotlib', 'PIL')
+# maximum import time of an entry point (in ms)
+IMPORT_BUDGET = 250
+# number of measurements per entry point, the fastest one counts
+REPEATS = 5
+
+
+def measure_import(module):
+    """
+    Imports a module in a new Python process and reads the import times of all modules loaded by it.
+
+    Parameters:
+        module (str): The name of the module to import.
+
+    Returns:
+        dict: The cumulative import time of every loaded module (in ms).
+    """
+    sourceDirectory = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    environment = dict(os.environ, PYTHONPATH=sourceDirectory)
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=environment,
+                            capture_output=True, text=True, check=True).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1000  # µs to ms
+    return times
+
+
+if __name__ == '__main__':
+    failed = False
+    for module in ENTRY_POINTS:
+        measurements = [measure_import(module) for _ in range(REPEATS)]
+        times = min(measurements, key=lambda measurement: measurement[module])
+        heavy = sorted({name.split(".")[0] for name in times} & set(HEAVY_MODULES))
+
+        print(f"{module}: {times[module]:.1f} ms (numpy: {times.get('numpy', 0):.1f} ms)")
+        if heavy:
+            print(f"\tImports {', '.join(heavy)} at startup.")
+            failed = True
+        if times[module] > IMPORT_BUDGET:
+            print(f"\tExceeds the budget of {IMPORT_BUDGET} ms.")
+            failed = True
+
+    if failed:
+        exit(-1)
+    print("Import times are within the budget.")
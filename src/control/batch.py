@@ -0,0 +1,286 @@
+import os
+import sys
+
+from control.validation import validate, get_absolute_path, load_config
+from control.cache import restore_result, store_result
+from control.export import save_trajectory
+from control.feasibility import find_infeasibility
+from control.optimization import solve, printResults, setOptimizationResults
+from control.simulation import simulate
+from model.variables import SimulationContext, configFile, RESULT_NAMES
+
+"""
+Runs many named scenarios back to back in this one process, so the interpreter starts, the modules are imported and
+the configuration files are parsed only once. The scenarios are read from a scenario file, or from every YAML file of
+a directory. Each scenario inherits the parameters of a base and only overrides some of them:
+
+base: config.yaml  # file the scenarios inherit from, relative to the scenario file (default: the configuration file)
+parameters:  # overrides for all scenarios of the file (optional)
+  ...
+scenarios:
+  slow:
+    parameters:
+      environmental:
+        velocity: 10  # short for "velocity: {value: 10}"
+  slowAndCold:
+    base: slow  # another scenario to inherit from
+    parameters:
+      environmental:
+        temperature: 5
+
+Usage: python batch.py <scenario file or directory> [scenario names] (from src/control)
+All scenarios are validated before the first one runs. No windows are opened; the trajectory, the rendered views, the
+video and the report are written to the files configured for a scenario, with the name of the scenario appended.
+"""
+
+# stages of a scenario that are timed one after another, the stages timed within them (e.g. findStartingValue) are not
+# reported, so the times can be added up
+STAGES = ('validate', 'optimize', 'simulate', 'export_video')
+
+
+def get_scenarios(path):
+    """
+    Reads all scenarios of a scenario file or directory and resolves their inheritance.
+
+    Parameters:
+        path (str): The absolute path of a scenario file, or of a directory of scenario files (.yaml or .yml).
+
+    Returns:
+        dict: The complete configuration of every scenario by its name, in the order of the files.
+    """
+    if os.path.isdir(path):
+        files = [os.path.join(path, file) for file in sorted(os.listdir(path)) if file.endswith((".yaml", ".yml"))]
+    else:
+        files = [path]
+
+    definitions = {}  # the base of the file and the definition of every scenario
+    for file in files:
+        data = load_config(file)
+        base = data.get("base")
+        base = load_config(os.path.join(os.path.dirname(file), base) if base else get_absolute_path(configFile))
+        base = merge_config(base, {"parameters": data.get("parameters") or {}})
+
+        for name, definition in (data.get("scenarios") or {}).items():
+            if name in definitions:
+                print(f"Scenario {name} is defined more than once.")
+                exit(-1)
+            definitions[name] = (base, definition or {})
+
+    scenarios = {}
+    for name in definitions:
+        resolve_scenario(name, definitions, scenarios, ())
+    return scenarios
+
+
+def resolve_scenario(name, definitions, scenarios, chain):
+    """
+    Builds the complete configuration of a scenario by applying its overrides to its base, which is resolved first if
+    it is another scenario. Exits the program if the base does not exist or the scenarios inherit from each other in a
+    circle.
+
+    Parameters:
+        name (str): The name of the scenario.
+        definitions (dict): The base of the file and the definition of every scenario by its name.
+        scenarios (dict): The scenarios resolved so far, which the scenario is added to.
+        chain (tuple): The names of the scenarios inheriting from this one, to detect circles.
+
+    Returns:
+        dict: The complete configuration of the scenario.
+    """
+    if name in scenarios:
+        return scenarios[name]
+    if name in chain:
+        print(f"Scenarios inherit from each other in a circle: {' -> '.join(chain + (name,))}.")
+        exit(-1)
+
+    base, definition = definitions[name]
+    if definition.get("base") is not None:
+        if definition["base"] not in definitions:
+            print(f"Scenario {name} inherits from the unknown scenario {definition['base']}.")
+            exit(-1)
+        base = resolve_scenario(definition["base"], definitions, scenarios, chain + (name,))
+
+    scenarios[name] = merge_config(base, {"parameters": definition.get("parameters") or {}})
+    return scenarios[name]
+
+
+def merge_config(base, overrides):
+    """
+    Applies overrides to a configuration. Nested entries are merged, so an override only needs to name the entries it
+    changes. A plain value for a parameter replaces the value of the parameter. Neither configuration is changed.
+
+    Parameters:
+        base (dict): The configuration to start from.
+        overrides (dict): The entries to change.
+
+    Returns:
+        dict: The merged configuration.
+    """
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = merge_config(merged[key], value)
+        elif isinstance(merged.get(key), dict) and "value" in merged[key]:
+            merged[key] = {**merged[key], "value": value}
+        else:
+            merged[key] = value
+    return merged
+
+
+def get_scenario_path(path, name):
+    """
+    Returns the output file of a scenario, so the scenarios of a batch do not overwrite each other.
+
+    Parameters:
+        path (str): The configured output file or directory, relative to the project.
+        name (str): The name of the scenario.
+
+    Returns:
+        str: The absolute path with the name of the scenario appended, e.g. "render_slow.png" for "render.png".
+    """
+    root, extension = os.path.splitext(get_absolute_path(path))
+    return f"{root}_{name}{extension}"
+
+
+def run_batch(scenarios):
+    """
+    Validates all scenarios, and then optimizes and simulates them one after another. A failed optimization is
+    reported, and the batch continues with the next scenario. The views of all scenarios are rendered at the end, into
+    one reused figure.
+
+    Parameters:
+        scenarios (dict): The complete configuration of every scenario by its name.
+
+    Returns:
+        list: The optimized parameters of every scenario, whether the optimization succeeded and the time of every
+            stage (in s).
+    """
+    contexts = {}
+    for name, data in scenarios.items():
+        print(f"Scenario {name}:")
+        context = SimulationContext()
+        with context.instrumentation.phase("validate"):
+            validate(context, data)
+        contexts[name] = context
+
+    renders = []  # the views to render, see `render_batch`
+    rows = [run_scenario(name, context, renders) for name, context in contexts.items()]
+
+    if renders:
+        from view.wholeView import render_batch
+        render_batch(renders)
+    return rows
+
+
+def run_scenario(name, context, renders):
+    """
+    Optimizes and simulates a validated scenario, and writes its configured output files. The views are only added to
+    `renders`, so all scenarios can be rendered into the same figure.
+
+    Parameters:
+        name (str): The name of the scenario.
+        context (SimulationContext): The validated scenario.
+        renders (list): The views to render, which the views of the scenario are added to if renderFile is set.
+
+    Returns:
+        dict: The optimized parameters of the scenario, whether the optimization succeeded and the time of every
+            stage (in s).
+    """
+    print(f"\nScenario {name}:")
+    timings = context.instrumentation
+    row = {'scenario': name, **{parameter: None for parameter in RESULT_NAMES}, 'success': False}
+
+    reason = find_infeasibility(context)
+    if reason is not None:
+        print(f"\t{reason}")
+        print("Scenario is infeasible.")
+        row.update(get_stage_times(timings))
+        return row
+
+    with timings.phase("optimize"):
+        print("Optimizing values...")
+        if context.useCache and restore_result(context):
+            print("\tCached result found.")
+            row['success'] = True
+        else:
+            result = solve(context)
+            if result is not None:
+                print(f"\t{result.message}.")
+            if result is not None and result.success:
+                setOptimizationResults(*result.x, context)
+                if context.useCache:
+                    store_result(context)
+                row['success'] = True
+
+    if row['success']:
+        printResults([getattr(context, parameter) for parameter in RESULT_NAMES], context)
+        print("Optimization finished.")
+        row.update({parameter: float(getattr(context, parameter)) for parameter in RESULT_NAMES})
+
+        with timings.phase("simulate"):
+            simulate(context)
+
+        if context.trajectoryFile:
+            save_trajectory(get_scenario_path(context.trajectoryFile, name), context)
+        if context.videoFile:
+            from view.videoView import export_video
+            with timings.phase("export_video"):
+                export_video(context.trajectory, context, get_scenario_path(context.videoFile, name),
+                             context.videoWorkers or os.cpu_count(),
+                             get_scenario_path(context.trajectoryFile, name) if context.trajectoryFile else None)
+        if context.showViews and context.renderFile:
+            renders.append((context.trajectory, int(len(context.trajectory) / 2), context,
+                            get_scenario_path(context.renderFile, name)))
+    else:
+        print("Optimization failed.")
+
+    if context.reportFile:
+        timings.write_report(get_scenario_path(context.reportFile, name))
+
+    row.update(get_stage_times(timings))
+    return row
+
+
+def get_stage_times(timings):
+    """
+    Returns the wall time of every top-level stage a scenario went through, see STAGES.
+
+    Parameters:
+        timings (Instrumentation): The instrumentation of the scenario.
+
+    Returns:
+        dict: The time of every stage (in s), by the name of the stage followed by "Time".
+    """
+    return {stage + "Time": timings.phases[stage]['wall'] for stage in STAGES if stage in timings.phases}
+
+
+def print_summary(rows):
+    """
+    Prints the outcome and the time of every scenario of the batch.
+
+    Parameters:
+        rows (list): The results of `run_batch`.
+
+    Returns:
+        None
+    """
+    print("\nBatch finished:")
+    for row in rows:
+        time = sum(value for key, value in row.items() if key.endswith("Time"))
+        outcome = f"turnIncline {row['turnIncline']:.2f}°" if row['success'] else "failed"
+        print(f"\t{row['scenario']}: {outcome} ({time:.2f} s)")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python batch.py <scenario file or directory> [scenario names]")
+        exit(-1)
+
+    scenarios = get_scenarios(os.path.abspath(sys.argv[1]))
+    names = sys.argv[2:] or list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(unknown)}.")
+        exit(-1)
+
+    print_summary(run_batch({name: scenarios[name] for name in names}))
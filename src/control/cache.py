@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from control.validation import get_absolute_path
+from control.warmstart import add_solution, INDEX_FILE
+from model.trajectory import FORCE_NAMES
+from model.variables import RESULT_NAMES
+
+# inputs that determine the optimum: the environmental parameters, the weights and the tolerance
+INPUT_NAMES = ('turnAngle', 'velocity', 'wheelDistance', 'temperature', 'gravityAcceleration', 'gasContent',
+               'roadWidth', 'weight_turnIncline', 'weight_mass', 'weight_staticFriction', 'weight_cdValue',
+               'weight_frontArea', 'weight_atmosphericPressure', 'inaccuracyTolerance')
+
+
+def get_cache_key(context):
+    """
+    Creates the key of a scenario in the optimization cache. It is a hash over all inputs that affect the optimum,
+    including the constraint ranges. Numbers are normalized to floats, so e.g. 40 and 40.0 lead to the same key.
+
+    Parameters:
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        str: The SHA-256 hex digest of the normalized inputs.
+    """
+    inputs = {name: normalize(getattr(context, name)) for name in INPUT_NAMES}
+    inputs['CONSTRAINTS'] = {name: normalize(range_) for name, range_ in context.CONSTRAINTS.items()}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def normalize(value):
+    """
+    Converts a configuration value to a representation that does not depend on how it was written.
+
+    Parameters:
+        value: A number, a None or a list/tuple of them.
+
+    Returns:
+        The value with all numbers as floats and all sequences as lists.
+    """
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    if value is None or isinstance(value, bool):
+        return value
+    return float(value)
+
+
+def get_cache_path(context):
+    """
+    Returns the file of a scenario in the optimization cache.
+
+    Parameters:
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        str: The absolute path of the cache entry.
+    """
+    return os.path.join(get_absolute_path(context.cacheDirectory), get_cache_key(context) + ".npz")
+
+
+def restore_result(context):
+    """
+    Looks up a scenario in the optimization cache and, if found, sets the cached optimized parameters and force vectors
+    to the context. A hit marks the entry as recently used.
+
+    Parameters:
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        bool: True if the result was restored from the cache, False otherwise.
+    """
+    path = get_cache_path(context)
+    try:
+        with np.load(path) as entry:
+            x, vectors = entry['x'], entry['vectors']
+        os.utime(path)  # the modification time orders the entries for the eviction
+    except (OSError, KeyError, ValueError):  # missing, evicted meanwhile or unreadable
+        return False
+
+    for name, value in zip(RESULT_NAMES, x):
+        setattr(context, name, float(value))
+    for name, vector in zip(FORCE_NAMES, vectors):
+        setattr(context, name, vector)
+    return True
+
+
+def store_result(context):
+    """
+    Writes the optimized parameters and force vectors of a scenario to the optimization cache. The entry is written to a
+    temporary file first and then renamed, so parallel processes never read incomplete entries. Afterwards, the least
+    recently used entries are evicted until the cache fits into cacheSize again. The result is also added to the
+    index of solved scenarios used for warm starts.
+
+    Parameters:
+        context (SimulationContext): The optimized scenario.
+
+    Returns:
+        None
+    """
+    path = get_cache_path(context)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        np.savez(f, x=np.array([getattr(context, name) for name in RESULT_NAMES], dtype=float),
+                 vectors=np.array([getattr(context, name) for name in FORCE_NAMES], dtype=float))
+    os.replace(temporary, path)
+    add_solution(context)  # makes the result available as a starting value for similar scenarios
+
+    evict(os.path.dirname(path), context.cacheSize * 1024 * 1024)
+
+
+def evict(directory, maxSize):
+    """
+    Deletes the least recently used entries of the optimization cache until its total size fits into maxSize. The index
+    of solved scenarios is not an entry and is kept.
+
+    Parameters:
+        directory (str): The cache directory.
+        maxSize (int): The maximum total size of the entries (in bytes).
+
+    Returns:
+        None
+    """
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".npz") and entry.name != INDEX_FILE:
+            try:
+                stat = entry.stat()
+            except OSError:  # evicted by another process meanwhile
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    size = sum(entry[1] for entry in entries)
+    for _, entrySize, path in sorted(entries):  # oldest first
+        if size <= maxSize:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        size -= entrySize
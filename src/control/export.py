@@ -0,0 +1,125 @@
+import json
+import os
+from dataclasses import fields
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from control.simulation import simulate_stream, get_dtype
+from model.trajectory import Trajectory, FORCE_NAMES
+from model.variables import SimulationContext
+
+# arrays of a trajectory, each stored as "<name>.npy" within the trajectory directory
+ARRAY_NAMES = ('times', 'angles', 'positions', 'vectors')
+# file holding the parameters of the simulated scenario
+HEADER_FILE = "header.json"
+
+
+def save_trajectory(path, context):
+    """
+    Writes the simulated trajectory of a scenario to a directory. Every array of the trajectory is stored as a binary
+    .npy file, which can be memory-mapped when reloaded. The optimized parameters and everything else needed to render
+    the views are stored in a small JSON header next to them.
+
+    Parameters:
+        path (str): The directory to write to. It is created if it does not exist.
+        context (SimulationContext): The simulated scenario, holding the trajectory.
+
+    Returns:
+        None
+    """
+    print(f"Saving trajectory to {path}...")
+
+    os.makedirs(path, exist_ok=True)
+    for name in ARRAY_NAMES:
+        np.save(os.path.join(path, name + ".npy"), getattr(context.trajectory, name))
+    save_header(path, context)
+
+    print("Saving finished.")
+
+
+def save_trajectory_stream(path, context, chunkSize):
+    """
+    Simulates a scenario and writes the trajectory to a directory like `save_trajectory`, without holding the whole
+    trajectory in memory. The files are allocated up front and filled chunk by chunk from `simulate_stream`, so the
+    memory stays bounded by the chunk size.
+
+    Parameters:
+        path (str): The directory to write to. It is created if it does not exist.
+        context (SimulationContext): The optimized scenario to simulate.
+        chunkSize (int): The maximum number of steps simulated at once.
+
+    Returns:
+        None
+    """
+    os.makedirs(path, exist_ok=True)
+    steps = context.simulationIterations + 1
+    dtype = get_dtype(context)
+
+    times = open_memmap(os.path.join(path, "times.npy"), mode='w+', dtype=dtype, shape=(steps,))
+    angles = open_memmap(os.path.join(path, "angles.npy"), mode='w+', dtype=dtype, shape=(steps,))
+    positions = open_memmap(os.path.join(path, "positions.npy"), mode='w+', dtype=dtype, shape=(steps, 3))
+
+    first = 0
+    for chunk in simulate_stream(context, chunkSize):
+        last = first + len(chunk)
+        times[first:last] = chunk.times
+        angles[first:last] = chunk.angles
+        positions[first:last] = chunk.positions
+        first = last
+
+    for array in (times, angles, positions):
+        array.flush()
+    np.save(os.path.join(path, "vectors.npy"), chunk.vectors)
+    save_header(path, context)
+
+    print(f"Saved trajectory to {path}.")
+
+
+def save_header(path, context):
+    """
+    Writes the parameters of a scenario to the JSON header of a trajectory directory. The force vectors and the
+    trajectory itself are left out, as they are stored in the binary files, and so are the timings of the run.
+
+    Parameters:
+        path (str): The trajectory directory.
+        context (SimulationContext): The simulated scenario.
+
+    Returns:
+        None
+    """
+    header = {}
+    for field in fields(SimulationContext):
+        if field.name in FORCE_NAMES or field.name in ('trajectory', 'instrumentation'):
+            continue
+        header[field.name] = getattr(context, field.name)
+
+    with open(os.path.join(path, HEADER_FILE), 'w') as f:
+        json.dump(header, f, indent=4)
+
+
+def load_trajectory(path):
+    """
+    Reloads a trajectory written by `save_trajectory` or `save_trajectory_stream`. The arrays are memory-mapped
+    read-only instead of being read, so even gigabyte-scale trajectories load instantly and only the steps actually
+    used by the views are read from disk.
+
+    Parameters:
+        path (str): The trajectory directory.
+
+    Returns:
+        tuple: The trajectory and a SimulationContext rebuilt from the header, including the force vectors.
+    """
+    arrays = {name: np.load(os.path.join(path, name + ".npy"), mmap_mode='r') for name in ARRAY_NAMES}
+    trajectory = Trajectory(**arrays, dtype=arrays['times'].dtype)  # same dtype, so the arrays are not copied
+
+    with open(os.path.join(path, HEADER_FILE), 'r') as f:
+        header = json.load(f)
+    header['CONSTRAINTS'] = {name: tuple(range_) for name, range_ in header['CONSTRAINTS'].items()}
+
+    context = SimulationContext(**header)
+    for name, vector in zip(FORCE_NAMES, trajectory.vectors):
+        setattr(context, name, np.array(vector, dtype=np.float64))
+    context.trajectory = trajectory
+
+    return trajectory, context
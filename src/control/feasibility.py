@@ -0,0 +1,145 @@
+import numpy as np
+
+from control.formulae import init_vectors_batch
+from control.optimization import get_bounds
+
+# number of turn inclines the bounds of turnIncline are scanned at
+INCLINE_STEPS = 256
+
+
+def check_feasibility(context):
+    """
+    Checks that the scenario can be solved at all before optimizing it, see `find_infeasibility`. Exits the program
+    with an explanation if it can not.
+
+    Parameters:
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        None
+    """
+    print("Checking feasibility...")
+
+    reason = find_infeasibility(context)
+    if reason is not None:
+        print(f"\t{reason}")
+        print("Scenario is infeasible.")
+        exit(-1)
+
+    print("Feasibility check finished.")
+
+
+def find_infeasibility(context):
+    """
+    Checks whether any parameters within the bounds can satisfy the friction constraint, which is the only constraint
+    the parameters have to be fitted to (the others hold by the construction of the force vectors). The static friction
+    required to keep the car on the road is compared with the bounds of staticFriction, widened by the inaccuracy
+    tolerance. Only a necessary condition is checked: a scenario that passes can still fail to optimize.
+
+    Parameters:
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        str: An explanation which bounds make the scenario infeasible, or None if it may be feasible.
+
+    Formula:
+        - feasible if minRequired * (1 - tolerance) <= maxFriction and maxRequired * (1 + tolerance) >= minFriction
+    """
+    frictionBounds = context.CONSTRAINTS["staticFriction"]
+    tolerance = context.inaccuracyTolerance
+    required = get_required_friction(context)
+
+    if required['minimum'] * (1 - tolerance) > frictionBounds[1]:
+        binding = get_binding_bounds(required['minimumIncline'], required['minimumRatio'], required, context)
+        return (f"The friction force is at least {required['minimum']:.3f} times the normal force, but staticFriction is "
+                f"at most {frictionBounds[1]} (with a tolerance of {tolerance}). It is the least at a turnIncline "
+                f"of {required['minimumIncline']:.2f}°{binding}.")
+    if required['maximum'] * (1 + tolerance) < frictionBounds[0]:
+        binding = get_binding_bounds(required['maximumIncline'], required['maximumRatio'], required, context)
+        return (f"The friction force is at most {required['maximum']:.3f} times the normal force, but staticFriction is "
+                f"at least {frictionBounds[0]} (with a tolerance of {tolerance}). It is the most at a turnIncline "
+                f"of {required['maximumIncline']:.2f}°{binding}.")
+    return None
+
+
+def get_required_friction(context):
+    """
+    Calculates the range of the static friction coefficient the car needs within the bounds of the optimization
+    parameters. The friction force has to make up for the centrifugal force and the downhill force, relative to the
+    normal force. Per turn incline, the force vectors are scaled to a drag of 1 N and a weight of 1 N, so the required
+    friction only depends on the ratio of drag to weight, which is bounded by the bounds of mass, cdValue, frontArea
+    and atmosphericPressure. The required friction is convex in this ratio, so its extremes are found in closed form;
+    the turn inclines are scanned in INCLINE_STEPS steps.
+
+    Parameters:
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        dict: The minimum and maximum required friction, with the turn incline (in °) and the drag to weight ratio they
+            are reached at, and the bounds of the drag to weight ratio.
+
+    Formula:
+        - ratio = |f_drag| / |f_gravity|
+        - required = |ratio * f_centrifugal / |f_drag| + f_gravity_parallel / |f_gravity|| / (|f_neutral| / |f_gravity|)
+        - vertex = -(u · w) / |u|², with u = f_centrifugal / |f_drag| and w = f_gravity_parallel / |f_gravity|
+    """
+    lower, upper = np.transpose(get_bounds(context.CONSTRAINTS))
+    samples = np.tile(lower, (INCLINE_STEPS, 1))
+    samples[:, 0] = np.linspace(lower[0], upper[0], INCLINE_STEPS)
+
+    # forces at the lower bounds, which scale linearly with the drag and the weight
+    forces = init_vectors_batch(samples, context.gasContent, context.temperature, context.velocity, context.turnAngle,
+                                context.gravityAcceleration)
+    drag = np.linalg.norm(forces[:, 0], axis=1)
+    weight = np.linalg.norm(forces[:, 4], axis=1)
+    centrifugal = np.divide(forces[:, 3], drag[:, None], out=np.zeros((INCLINE_STEPS, 3)), where=drag[:, None] > 0)
+    parallel = forces[:, 5] / weight[:, None]
+    neutral = np.linalg.norm(forces[:, 6], axis=1) / weight
+
+    # the drag grows with cdValue, frontArea and atmosphericPressure, the weight with the mass
+    minRatio = drag[0] / (weight[0] * upper[1] / lower[1])
+    maxRatio = drag[0] * np.prod(upper[3:6] / lower[3:6]) / weight[0]
+    squaredNorm = np.sum(centrifugal ** 2, axis=1)
+    vertex = np.divide(-np.sum(centrifugal * parallel, axis=1), squaredNorm, out=np.full(INCLINE_STEPS, minRatio),
+                       where=squaredNorm > 0)
+    ratios = np.stack([np.full(INCLINE_STEPS, minRatio), np.full(INCLINE_STEPS, maxRatio),
+                       np.clip(vertex, minRatio, maxRatio)], axis=1)
+
+    friction = np.linalg.norm(ratios[:, :, None] * centrifugal[:, None] + parallel[:, None], axis=2) / neutral[:, None]
+    minimum = np.unravel_index(np.argmin(friction), friction.shape)
+    maximum = np.unravel_index(np.argmax(friction[:, 0:2]), (INCLINE_STEPS, 2))  # the maximum is at an end
+
+    return {'minimum': friction[minimum], 'minimumIncline': samples[minimum[0], 0], 'minimumRatio': ratios[minimum],
+            'maximum': friction[maximum], 'maximumIncline': samples[maximum[0], 0], 'maximumRatio': ratios[maximum],
+            'ratioBounds': (minRatio, maxRatio)}
+
+
+def get_binding_bounds(incline, ratio, required, context):
+    """
+    Describes which bounds limit the required friction, i.e. which bounds the extreme was reached at.
+
+    Parameters:
+        incline (float): The turn incline of the extreme (in °).
+        ratio (float): The drag to weight ratio of the extreme.
+        required (dict): The range of the required friction from `get_required_friction`.
+        context (SimulationContext): The validated scenario.
+
+    Returns:
+        str: The bounds the extreme lies on, as the end of a sentence.
+    """
+    inclineBounds = context.CONSTRAINTS["turnIncline"]
+    minRatio, maxRatio = required['ratioBounds']
+
+    bounds = []
+    if np.isclose(incline, inclineBounds[0]):
+        bounds.append("the lower bound of turnIncline")
+    elif np.isclose(incline, inclineBounds[1]):
+        bounds.append("the upper bound of turnIncline")
+    if minRatio != maxRatio and np.isclose(ratio, minRatio):
+        bounds.append("the upper bound of mass and the lower bounds of cdValue, frontArea and atmosphericPressure")
+    elif minRatio != maxRatio and np.isclose(ratio, maxRatio):
+        bounds.append("the lower bound of mass and the upper bounds of cdValue, frontArea and atmosphericPressure")
+
+    if not bounds:
+        return ""
+    return ", binding " + " and ".join(bounds)
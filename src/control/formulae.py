@@ -37,6 +37,66 @@ def init_vectors(turnIncline, mass, cdValue, frontArea, airPressure, gasContent,
             f_static_friction, f_centripetal)
 
 
+def init_vectors_batch(x, gasContent, temperature, velocity, turnAngle, gravityAcceleration):
+    """
+    Initializes the force vectors for many candidate parameter sets at once. Produces the same vectors as
+    `init_vectors`, but builds them with whole-array operations instead of one small array per vector and candidate.
+
+    Parameters:
+        x (np.array): An (N, 6) array with the rows [turnIncline, mass, staticFriction, cdValue, frontArea,
+            atmosphericPressure].
+        gasContent (float): The specific gas content at the current temperature (in J/(kg·pK)).
+        temperature (float): The temperature (in °C).
+        velocity (float): The velocity of the car (in m/s).
+        turnAngle (float): The angle between the front and back tires of the car (in °).
+        gravityAcceleration (float): The acceleration due to gravity (in m/s²).
+
+    Returns:
+        np.array: An (N, 10, 3) array of force vectors, ordered like the tuple returned by `init_vectors`.
+
+    Formula:
+        - f_new_velocity = R_z(turnIncline) @ R_y(turnAngle) @ f_velocity
+        - f_gravity_parallel = R_z(270° + turnIncline) @ [0, -|f_gravity| * sin(turnIncline), 0]
+        - f_neutral = R_z(turnIncline) @ [0, -|f_gravity| * cos(turnIncline), 0]
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    turnIncline = x[:, 0]
+    mass = x[:, 1]
+    cdValue = x[:, 3]
+    frontArea = x[:, 4]
+    airPressure = x[:, 5]
+
+    forces = np.zeros((x.shape[0], 10, 3))
+
+    # f_drag and f_velocity (rotated by 180° around the y-axis)
+    forces[:, 0, 2] = 0.5 * get_airDensity(airPressure, temperature, gasContent) * cdValue * frontArea * velocity ** 2
+    forces[:, 1] = transform_vector(forces[:, 0], 0, np.radians(180), 0)
+
+    # f_new_velocity: rotate f_velocity by the turn angle (y-axis), then by the turn incline (z-axis)
+    forces[:, 2] = transform_vector(transform_vector(forces[:, 1], 0, np.radians(turnAngle), 0), 0, 0,
+                                    np.radians(turnIncline))
+
+    # f_centrifugal and f_gravity
+    forces[:, 3] = forces[:, 1] - forces[:, 2]
+    forces[:, 4, 1] = -1 * mass * gravityAcceleration
+    gravity = np.linalg.norm(forces[:, 4], axis=1)
+
+    # f_gravity_parallel: rotate [0, -|f_gravity| * sin(turnIncline), 0] by 270° + turnIncline (z-axis)
+    forces[:, 5, 1] = -1 * gravity * np.sin(np.radians(turnIncline))
+    forces[:, 5] = transform_vector(forces[:, 5], 0, 0, np.radians(270 + turnIncline))
+
+    # f_neutral: rotate [0, -|f_gravity| * cos(turnIncline), 0] by turnIncline (z-axis)
+    forces[:, 6, 1] = -1 * gravity * np.cos(np.radians(turnIncline))
+    forces[:, 6] = transform_vector(forces[:, 6], 0, 0, np.radians(turnIncline))
+
+    # f_road (f_neutral rotated by 180° around the z-axis), f_static_friction and f_centripetal
+    forces[:, 7] = transform_vector(forces[:, 6], 0, 0, np.radians(180))
+    forces[:, 8] = (forces[:, 3] * -1) - forces[:, 5]
+    forces[:, 9] = forces[:, 3] * -1
+
+    return forces
+
+
 def init_f_drag(airPressure, gasContent, temperature, cdValue, frontArea, velocity):
     """
     Calculates the drag force experienced by the car based on the provided parameters.
@@ -213,7 +273,9 @@ def init_f_centripetal(f_centrifugal):
 def rotation_matrix(pitch, yaw, roll):
     """
     Creates a rotation matrix based on pitch, yaw, and roll angles.
-    Positive values rotate counterclockwise.
+    Positive values rotate counterclockwise. The angles may also be arrays of shape (N,), in which case a stack of
+    N rotation matrices is built at once. If only one of the angles is non-zero, its single-axis matrix is returned
+    directly instead of multiplying all three.
 
     Formula:
         R_x = rotation matrix for pitch
@@ -222,31 +284,42 @@ def rotation_matrix(pitch, yaw, roll):
         R = combined rotation matrix: R = R_z @ R_y @ R_x
 
     Parameters:
-        pitch (float): The pitch rotation angle (in radians).
-        yaw (float): The yaw rotation angle (in radians).
-        roll (float): The roll rotation angle (in radians).
+        pitch (float or np.array): The pitch rotation angle (in radians).
+        yaw (float or np.array): The yaw rotation angle (in radians).
+        roll (float or np.array): The roll rotation angle (in radians).
 
     Returns:
-        np.array: The resulting combined rotation matrix.
+        np.array: The resulting combined rotation matrix, of shape (3, 3) or (N, 3, 3).
     """
+    pitch, yaw, roll = np.broadcast_arrays(*(np.asarray(angle, dtype=float) for angle in (pitch, yaw, roll)))
+
     # Rotation matrices
-    R_x = np.array([
-        [1, 0, 0],
-        [0, np.cos(pitch), -np.sin(pitch)],
-        [0, np.sin(pitch), np.cos(pitch)]
-    ])
-
-    R_y = np.array([
-        [np.cos(yaw), 0, np.sin(yaw)],
-        [0, 1, 0],
-        [-np.sin(yaw), 0, np.cos(yaw)]
-    ])
-
-    R_z = np.array([
-        [np.cos(roll), -np.sin(roll), 0],
-        [np.sin(roll), np.cos(roll), 0],
-        [0, 0, 1]
-    ])
+    R_x = np.zeros(pitch.shape + (3, 3))
+    R_x[..., 0, 0] = 1
+    R_x[..., 1, 1] = np.cos(pitch)
+    R_x[..., 1, 2] = -np.sin(pitch)
+    R_x[..., 2, 1] = np.sin(pitch)
+    R_x[..., 2, 2] = np.cos(pitch)
+    if not yaw.any() and not roll.any():
+        return R_x
+
+    R_y = np.zeros(yaw.shape + (3, 3))
+    R_y[..., 0, 0] = np.cos(yaw)
+    R_y[..., 0, 2] = np.sin(yaw)
+    R_y[..., 1, 1] = 1
+    R_y[..., 2, 0] = -np.sin(yaw)
+    R_y[..., 2, 2] = np.cos(yaw)
+    if not pitch.any() and not roll.any():
+        return R_y
+
+    R_z = np.zeros(roll.shape + (3, 3))
+    R_z[..., 0, 0] = np.cos(roll)
+    R_z[..., 0, 1] = -np.sin(roll)
+    R_z[..., 1, 0] = np.sin(roll)
+    R_z[..., 1, 1] = np.cos(roll)
+    R_z[..., 2, 2] = 1
+    if not pitch.any() and not yaw.any():
+        return R_z
 
     # Combined rotation matrix
     return R_z @ R_y @ R_x
@@ -255,20 +328,78 @@ def rotation_matrix(pitch, yaw, roll):
 def transform_vector(vector, pitch, yaw, roll):
     """
     Transforms a vector based on pitch, yaw, and roll angles by applying a rotation matrix.
-    Positive values rotate counterclockwise.
+    Positive values rotate counterclockwise. Works on stacks of vectors as well: with angles of shape (N,), vectors of
+    shape (N, 3) are rotated by their own angles, and vectors of shape (N, K, 3) rotate all K vectors of a row by the
+    same angles. Scalar angles rotate every vector of a (K, 3) array. If only the yaw or only the roll angle is
+    non-zero, the rotation is applied in closed form without building any matrices.
 
     Parameters:
-        vector (np.array): The vector to be transformed.
-        pitch (float): The pitch rotation angle (in radians).
-        yaw (float): The yaw rotation angle (in radians).
-        roll (float): The roll rotation angle (in radians).
+        vector (np.array): The vector(s) to be transformed, of shape (3,), (K, 3), (N, 3) or (N, K, 3).
+        pitch (float or np.array): The pitch rotation angle (in radians).
+        yaw (float or np.array): The yaw rotation angle (in radians).
+        roll (float or np.array): The roll rotation angle (in radians).
 
     Returns:
-        np.array: The transformed vector.
+        np.array: The transformed vector(s), of the same shape as `vector`.
+
+    Formula:
+        - yaw only: [cos(yaw) * x + sin(yaw) * z, y, -sin(yaw) * x + cos(yaw) * z]
+        - roll only: [cos(roll) * x - sin(roll) * y, sin(roll) * x + cos(roll) * y, z]
     """
     # pitch = x (counterclockwise), yaw = y (counterclockwise), roll = z (counterclockwise)
+    vector = np.asarray(vector, dtype=float)
+
+    if np.ndim(pitch) == np.ndim(yaw) == np.ndim(roll) == 0:
+        # single angles: every vector is rotated by the same matrix
+        if pitch == 0 and roll == 0:
+            return rotate_single_axis(vector, np.cos(yaw), -np.sin(yaw), 0, 2)
+        if pitch == 0 and yaw == 0:
+            return rotate_single_axis(vector, np.cos(roll), np.sin(roll), 0, 1)
+        return vector @ rotation_matrix(pitch, yaw, roll).T
+
+    pitch, yaw, roll = np.broadcast_arrays(*(np.asarray(angle, dtype=float) for angle in (pitch, yaw, roll)))
+
+    # angles apply to every vector of the remaining (K) axis
+    extraAxes = (1,) * (vector.ndim - 1 - pitch.ndim)
+
+    if not pitch.any() and not roll.any():
+        return rotate_single_axis(vector, np.cos(yaw).reshape(yaw.shape + extraAxes),
+                                  -np.sin(yaw).reshape(yaw.shape + extraAxes), 0, 2)
+    if not pitch.any() and not yaw.any():
+        return rotate_single_axis(vector, np.cos(roll).reshape(roll.shape + extraAxes),
+                                  np.sin(roll).reshape(roll.shape + extraAxes), 0, 1)
+
     R = rotation_matrix(pitch, yaw, roll)
-    return R @ vector
+    R = R.reshape(pitch.shape + extraAxes + (3, 3))
+    return np.einsum('...ij,...j->...i', R, vector)
+
+
+def rotate_single_axis(vector, cos, sin, first, second):
+    """
+    Rotates vectors around a single coordinate axis in closed form. The rotation mixes the two components `first` and
+    `second`, the remaining component stays unchanged.
+
+    Parameters:
+        vector (np.array): The vector(s) to be rotated, with the components on the last axis.
+        cos (float or np.array): The cosine of the rotation angle(s), broadcastable against the vector components.
+        sin (float or np.array): The sine of the rotation angle(s), signed for the rotation direction.
+        first (int): The index of the first component taking part in the rotation.
+        second (int): The index of the second component taking part in the rotation.
+
+    Returns:
+        np.array: The rotated vector(s).
+
+    Formula:
+        - first' = cos * first - sin * second
+        - second' = sin * first + cos * second
+    """
+    if np.ndim(cos) == 0:
+        transformed = vector.copy()
+    else:
+        transformed = np.array(np.broadcast_to(vector, np.broadcast_shapes(vector.shape, np.shape(cos) + (3,))))
+    transformed[..., first] = cos * vector[..., first] - sin * vector[..., second]
+    transformed[..., second] = sin * vector[..., first] + cos * vector[..., second]
+    return transformed
 
 
 def get_airDensity(airPressure, temperature, gasContent):
@@ -0,0 +1,103 @@
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """
+    Collects the timings and counters of one scenario: the wall and CPU time of every stage of the pipeline, and how
+    often the expensive functions are called. Every context has its own instrumentation, so the counters of scenarios
+    running side by side do not mix. Work done in other processes, e.g. by the parallel starting value search, is not
+    counted.
+    """
+    __slots__ = ('phases', 'counters')
+
+    def __init__(self):
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Measures the wall and CPU time of a stage. The times of repeated stages with the same name are added up.
+
+        Parameters:
+            name (str): The name of the stage, e.g. "optimize".
+
+        Returns:
+            generator: A context manager measuring the code within it.
+        """
+        wallStart = time.perf_counter()
+        cpuStart = time.process_time()
+        try:
+            yield
+        finally:
+            phase = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            phase['wall'] += time.perf_counter() - wallStart
+            phase['cpu'] += time.process_time() - cpuStart
+            phase['calls'] += 1
+
+    def count(self, name, amount=1):
+        """
+        Increases a counter.
+
+        Parameters:
+            name (str): The name of the counter, e.g. "objective".
+            amount (int): The amount to add.
+
+        Returns:
+            None
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self):
+        """
+        Returns all timings (in s) and counters.
+
+        Returns:
+            dict: The stages with their wall time, CPU time and number of runs, and the counters.
+        """
+        return {'phases': self.phases, 'counters': self.counters}
+
+    def write_report(self, path):
+        """
+        Writes the report to a JSON file.
+
+        Parameters:
+            path (str): The JSON file to write.
+
+        Returns:
+            None
+        """
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=4)
+        print(f"Report written to {path}.")
+
+
+def start_profiler():
+    """
+    Starts profiling all function calls of this process with cProfile.
+
+    Returns:
+        cProfile.Profile: The running profiler.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def write_profile(profiler, path):
+    """
+    Stops a profiler and writes its statistics to a file, which can be read with pstats or tools like snakeviz.
+
+    Parameters:
+        profiler (cProfile.Profile): The profiler started by `start_profiler`.
+        path (str): The file to write.
+
+    Returns:
+        None
+    """
+    profiler.disable()
+    profiler.dump_stats(path)
+    print(f"Profile written to {path}.")
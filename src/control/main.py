@@ -1,8 +1,12 @@
-from control.validation import validate
+import os
+
+from control.validation import validate, get_absolute_path
 from control.optimization import optimize
 from control.simulation import simulate
-from model import variables
-from view.wholeView import init_views
+from control.export import save_trajectory, save_trajectory_stream, load_trajectory
+from control.feasibility import check_feasibility
+from control.instrumentation import start_profiler, write_profile
+from model.variables import SimulationContext
 
 """
 To whomever it may concern,
@@ -27,9 +31,57 @@ January 22, 2025
 """
 
 if __name__ == '__main__':
-    validate()  # checks values for domains
-    optimize()  # determines best values for the simulation
-    simulate()  # Simulates and plots the behaviour
+    context = SimulationContext()  # holds all values of this simulation
+    timings = context.instrumentation  # measures the stages of the program, see reportFile
+    # profileFile is only known after validating, so the profiler runs from the start and is dropped if it is not set
+    profiler = start_profiler()
+
+    with timings.phase("validate"):
+        validate(context)  # checks values for domains
+    if not context.profileFile:
+        profiler.disable()
+        profiler = None
+    check_feasibility(context)  # rejects scenarios no parameters within the bounds can solve
+
+    with timings.phase("optimize"):
+        optimize(context)  # determines best values for the simulation
+    if context.trajectoryFile and not context.showViews:
+        # nothing is shown, so the trajectory is written chunk by chunk and never held in memory as a whole
+        with timings.phase("simulate"):
+            save_trajectory_stream(get_absolute_path(context.trajectoryFile), context, context.trajectoryChunkSize)
+        context.trajectory, _ = load_trajectory(get_absolute_path(context.trajectoryFile))  # memory-mapped
+    else:
+        with timings.phase("simulate"):
+            simulate(context)  # Simulates and plots the behaviour
+
+        if context.trajectoryFile:  # keeps the result, so it can be viewed again with replay.py
+            save_trajectory(get_absolute_path(context.trajectoryFile), context)
+
+    # the views are imported only when needed, so runs without plots do not load matplotlib
+    if context.videoFile:  # renders the animation on several processes, which read the saved trajectory if there is one
+        from view.videoView import export_video
+        with timings.phase("export_video"):
+            export_video(context.trajectory, context, get_absolute_path(context.videoFile),
+                         context.videoWorkers or os.cpu_count(),
+                         get_absolute_path(context.trajectoryFile) if context.trajectoryFile else None)
+
+    # initializes views with two graphs. Focuses on the middle dataset, where the current vectors will be displayed.
+    # With a window, the wall time of this stage includes the time the window was open, its CPU time does not.
+    with timings.phase("init_views"):
+        if not context.showViews:  # fast path without any plot, e.g. for many short runs
+            pass
+        elif context.renderFile:  # without a window, e.g. on machines without a display
+            from view.wholeView import render_views
+            render_views(context.trajectory, int(len(context.trajectory) / 2), context,
+                         get_absolute_path(context.renderFile))
+        elif context.animate:  # shows the vectors rotating through the whole curve
+            from view.animationView import init_animation
+            init_animation(context.trajectory, context)
+        else:
+            from view.wholeView import init_views
+            init_views(context.trajectory, int(len(context.trajectory) / 2), context)
 
-    # initializes views with two graphs. Focuses on the middle dataset, where the current vectors will be displayed
-    init_views(variables.dataList, int(len(variables.dataList) / 2))
+    if context.reportFile:
+        timings.write_report(get_absolute_path(context.reportFile))
+    if profiler is not None:
+        write_profile(profiler, get_absolute_path(context.profileFile))
@@ -1,65 +1,119 @@
 import numpy as np
-from scipy.stats import qmc
-from scipy.optimize import minimize
 
-from control.formulae import init_vectors, transform_vector
-from model import variables
+from control.cache import restore_result, store_result
+from control.formulae import init_vectors, init_vectors_batch, transform_vector, get_airDensity
+from control.warmstart import nearest_solutions
 
+# strategies of searching a starting value, see the solver parameter
+SOLVERS = ('lhs', 'differential_evolution', 'shgo')
 
-def optimize():
+
+def optimize(context):
     """
-    Performs the optimization process for the vehicle parameters.
+    Performs the optimization process for the vehicle parameters. If the same scenario was optimized before, the
+    result is taken from the optimization cache instead. Exits the program if no optimum is found.
 
     Parameters:
-        None
+        context (SimulationContext): The scenario to optimize.
 
     Returns:
         None
     """
     print("Optimizing values...")
 
-    # create bounds
-    bounds = get_bounds(variables.CONSTRAINTS)
-
-    # find starting value
-    x0 = findStartingValue(bounds)
-
-    # create constraints
-    cons = constraints(x0)
+    if context.useCache and restore_result(context):
+        print("\tCached result found.")
+        printResults([context.turnIncline, context.mass, context.staticFriction, context.cdValue, context.frontArea,
+                      context.atmosphericPressure], context)
+        print("Optimization finished.")
+        return
 
-    # optimize with scipy minimize (SLSQP method)
-    result = minimize(objective, x0, method="SLSQP", bounds=bounds, constraints=cons)
+    result = solve(context)
 
-    if result.success:
+    if result is not None and result.success:
         print(f"\t{result.message}.")
 
-        print("\n\tInput values:")
-        print("\tTurn angle [deg]:", variables.turnAngle)
-        print("\tVelocity [m/s]:", variables.velocity)
-        print("\tTemperature [celsius]:", variables.temperature)
+        printResults(result.x, context)
 
-        print("\n\tOther values:")
-        print("\tGravity acceleration [m/s²]:", variables.gravityAcceleration)
-        print("\tInaccuracy tolerance: ", variables.inaccuracyTolerance)
-        print("\tGas content [J/(kg*pK)]: ", variables.gasContent)
+        setOptimizationResults(result.x[0], result.x[1], result.x[2], result.x[3], result.x[4], result.x[5], context)
 
-        print("\n\tOutput values:")
-        print("\tTurn incline [deg]:", result.x[0])
-        print("\tMass [kg]:", result.x[1])
-        print("\tStatic friction:", result.x[2])
-        print("\tCd-Value:", result.x[3])
-        print("\tFront area [m²]:", result.x[4])
-        print("\tAtmospheric pressure [Pa]:", result.x[5])
-
-        setOptimizationResults(result.x[0], result.x[1], result.x[2], result.x[3], result.x[4], result.x[5])
+        if context.useCache:
+            store_result(context)
 
         print(f"Optimization finished.")
     else:
-        print(f"\t{result.message}.")
+        if result is not None:
+            print(f"\t{result.message}.")
         print("Optimization failed.")
         exit(-1)
 
 
+def printResults(x, context):
+    """
+    Prints the input values of a scenario and its optimized parameters.
+
+    Parameters:
+        x (list): The optimized parameters [turnIncline, mass, staticFriction, cdValue, frontArea,
+            atmosphericPressure].
+        context (SimulationContext): The optimized scenario.
+
+    Returns:
+        None
+    """
+    print("\n\tInput values:")
+    print("\tTurn angle [deg]:", context.turnAngle)
+    print("\tVelocity [m/s]:", context.velocity)
+    print("\tTemperature [celsius]:", context.temperature)
+
+    print("\n\tOther values:")
+    print("\tGravity acceleration [m/s²]:", context.gravityAcceleration)
+    print("\tInaccuracy tolerance: ", context.inaccuracyTolerance)
+    print("\tGas content [J/(kg*pK)]: ", context.gasContent)
+
+    print("\n\tOutput values:")
+    print("\tTurn incline [deg]:", x[0])
+    print("\tMass [kg]:", x[1])
+    print("\tStatic friction:", x[2])
+    print("\tCd-Value:", x[3])
+    print("\tFront area [m²]:", x[4])
+    print("\tAtmospheric pressure [Pa]:", x[5])
+
+
+def solve(context, x0=None):
+    """
+    Searches a starting value and optimizes the vehicle parameters from it, without changing the context. Unlike
+    `optimize`, a failure is returned instead of exiting, so callers such as the sweep can carry on.
+
+    Parameters:
+        context (SimulationContext): The scenario to optimize.
+        x0 (list): The starting value to use, e.g. the optimum of a neighbouring scenario. If None, a starting value is
+            searched with `findStartingValue`.
+
+    Returns:
+        OptimizeResult: The result of the optimizer, or None if no starting value was found.
+    """
+    # create bounds
+    bounds = get_bounds(context.CONSTRAINTS)
+
+    # find starting value
+    if x0 is None:
+        with context.instrumentation.phase("findStartingValue"):
+            x0 = findStartingValue(bounds, context)
+        if x0 is None:
+            return None
+
+    # create constraints
+    cons = constraints(context)
+
+    # optimize with scipy minimize (SLSQP method), imported here so that cached runs do not load scipy
+    from scipy.optimize import minimize
+    result = minimize(objective, x0, args=(context,), method="SLSQP", jac=objective_jac, bounds=bounds,
+                      constraints=cons)
+    context.instrumentation.count("slsqp_solves")
+    context.instrumentation.count("slsqp_iterations", result.nit)
+    return result
+
+
 def get_bounds(constraints):
     """
     Extracts the bounds for each optimization parameter from the constraint definitions.
@@ -78,20 +132,40 @@ def get_bounds(constraints):
             (constraints["atmosphericPressure"][0], constraints["atmosphericPressure"][1])]
 
 
-def findStartingValue(bounds):
+def findStartingValue(bounds, context):
     """
-    Finds a feasible starting point for the optimization process using Latin Hypercube Sampling.
+    Finds a feasible starting point for the optimization process. The optima of the most similar scenarios solved before
+    are tried first. Otherwise the configured solver is used: with "lhs", Latin Hypercube Sampling is used, and the
+    samples are tried one after another, or spread over a pool of processes if more than one worker is configured. The
+    other solvers search globally, see `findGlobalStartingValue`.
 
     Parameters:
         bounds (list): The bounds for the optimization parameters.
+        context (SimulationContext): The scenario to optimize.
 
     Returns:
-        list: A feasible starting value for the optimization.
+        list: A feasible starting value for the optimization, or None if no sample is feasible.
     """
     print("\tFinding starting value", end='')
 
+    # try the optima of the most similar scenarios solved before
+    if context.warmStartNeighbours:
+        seeds = np.clip(nearest_solutions(context, context.warmStartNeighbours), *np.transpose(bounds))
+        index = trySamples(seeds, 0, bounds, context)
+        context.instrumentation.count("warm_starts_tried", len(seeds) if index is None else index + 1)
+        if index is not None:
+            print("\n\tStarting value found from a similar scenario.")
+            return seeds[index]
+
+    if context.solver not in SOLVERS:
+        print(f"\n\tUnknown solver {context.solver}, expected one of {', '.join(SOLVERS)}.")
+        exit(-1)
+    if context.solver != "lhs":
+        return findGlobalStartingValue(bounds, context)
+
     # using Latin Hypercube Sampling (LHS) to sample points from the parameter space
-    sampler = qmc.LatinHypercube(d=6)  # amount of parameters
+    from scipy.stats import qmc
+    sampler = qmc.LatinHypercube(d=6, rng=context.randomSeed)  # amount of parameters
     num_samples = 4000  # number of samples
     sample = sampler.random(n=num_samples)
 
@@ -103,39 +177,302 @@ def findStartingValue(bounds):
         lb < ub for lb, ub in zip(lower_bounds, upper_bounds)), "Each lower bound must be less than the upper bound."
     scaled_samples = qmc.scale(sample, lower_bounds, upper_bounds)
 
-    tries = 1
-    for x0 in scaled_samples:  # tries multiple starting values
-        cons = constraints(x0)  # construct constraints for the optimizer
-        result = minimize(objective, x0, method="SLSQP", bounds=bounds, constraints=cons)  # optimization
+    # only try the most promising samples with the optimizer
+    scaled_samples = screenSamples(scaled_samples, context.screeningCandidates, context)
+
+    if context.startingValueWorkers is not None and context.startingValueWorkers > 1:
+        index = findStartingValueParallel(scaled_samples, bounds, context.startingValueWorkers, context)
+    else:
+        index = trySamples(scaled_samples, 0, bounds, context)
+    context.instrumentation.count("samples_tried", len(scaled_samples) if index is None else index + 1)
+
+    if index is not None:
+        print("\n\tStarting value found.")
+        return scaled_samples[index]  # return the feasible starting value
+
+    print(f"\n\tNo starting value found after {len(scaled_samples)} samples.")
+    return None
+
+
+def findGlobalStartingValue(bounds, context):
+    """
+    Searches the best feasible parameters globally, which `solve` then polishes with SLSQP. Differential evolution
+    evolves a population of solverPopulation * 6 parameter sets for at most solverIterations generations, and evaluates
+    the objective and the constraints of the whole population at once. SHGO samples solverPopulation * 6 points and
+    minimizes locally from the most promising of them. As hardly any sampled point is feasible, SHGO minimizes the
+    objective with a penalty for the constraint violation, and SciPy evaluates its points one by one. Either way the
+    number of evaluations is bounded, unlike trying samples until one succeeds.
+
+    Parameters:
+        bounds (list): The bounds for the optimization parameters.
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        list: The best parameters found, or None if the search found no parameters.
+    """
+    from scipy.optimize import differential_evolution, shgo, NonlinearConstraint
+
+    population = context.solverPopulation * len(bounds)
+    if context.solver == "differential_evolution":
+        cons = NonlinearConstraint(lambda x: population_constraints(x, context), 0, np.inf)
+        result = differential_evolution(population_objective, bounds, args=(context,), constraints=cons,
+                                        popsize=context.solverPopulation, maxiter=context.solverIterations,
+                                        rng=context.randomSeed, polish=False, vectorized=True, updating='deferred')
+    else:
+        result = shgo(penalized_objective, bounds, args=(context,), n=population, iters=1, sampling_method='sobol',
+                      minimizer_kwargs={'method': "SLSQP"}, options={'local_iter': 3})
+        context.instrumentation.count("population_evaluations", result.nfev)
+
+    # the best parameters are only polished once, by `solve`, which also tells whether SLSQP succeeds from them
+    if result.x is not None:
+        print(f"\n\tStarting value found with {context.solver} after {result.nit} iterations.")
+        return result.x
+
+    print(f"\n\tNo starting value found with {context.solver} after {result.nit} iterations.")
+    return None
+
+
+def population_objective(population, context):
+    """
+    Evaluates the objective function for a population of differential evolution.
+
+    Parameters:
+        population (np.array): A (6, S) array with one parameter set per column.
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: The objective value of each parameter set.
+    """
+    population = np.atleast_2d(np.asarray(population).T)
+    context.instrumentation.count("population_evaluations", len(population))
+    return objective_batch(population, context)
+
+
+def population_constraints(population, context):
+    """
+    Evaluates the inequality constraints for a population of differential evolution. Undefined constraints count as
+    violated.
+
+    Parameters:
+        population (np.array): A (6, S) array with one parameter set per column, or a single parameter set.
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: A (10, S) array with the values of the inequality constraints of each parameter set.
+    """
+    values = ineq_constraints_batch(np.asarray(population).T, context)
+    return np.nan_to_num(values, nan=-1e12).T
+
+
+def penalized_objective(x, context):
+    """
+    Evaluates the objective function plus a penalty for violating the inequality constraints, so a search without
+    constraints is drawn towards the feasible parameters. The penalty is squared, so it stays smooth for the local
+    minimizer, and undefined constraints count as violated.
+
+    Parameters:
+        x (list): A list containing the parameters [turnIncline, mass, staticFriction, cdValue, frontArea,
+            atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        float: The penalized objective value.
+
+    Formula:
+        - penalty = sum(min(0, g_i(x))²)
+    """
+    values = np.nan_to_num(ineq_constraints_batch(x, context)[0], nan=-1e12)
+    return objective_batch(x, context)[0] + np.sum(np.minimum(0, values) ** 2)
+
+
+def screenSamples(samples, candidates, context):
+    """
+    Ranks the samples by how well they already satisfy the constraints and keeps the best ones. All inequality
+    constraints are evaluated for the whole sample matrix at once. Samples are ordered by their total constraint
+    violation first, samples with the same violation (in particular all feasible samples) by their objective value.
+
+    Parameters:
+        samples (np.array): An (N, 6) array of scaled samples.
+        candidates (int): The number of samples to keep. If None, all samples are kept in ranked order.
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: The best samples, ordered from most to least promising.
+
+    Formula:
+        - violation = sum(max(0, -g_i(x)))
+    """
+    context.instrumentation.count("samples_screened", len(samples))
+    violation = np.sum(np.maximum(0, -ineq_constraints_batch(samples, context)), axis=1)
+    violation[np.isnan(violation)] = np.inf  # undefined constraints can not be satisfied
+    ranking = np.lexsort((objective_batch(samples, context), violation))
+    return samples[ranking[:candidates]]
+
+
+def trySamples(samples, offset, bounds, context):
+    """
+    Tries the given samples as starting values in order and stops at the first one the optimizer succeeds with.
+    Prints a dot for every 40 samples tried.
+
+    Parameters:
+        samples (np.array): The samples to try as starting values.
+        offset (int): The index of the first sample within all samples, used for counting the tries.
+        bounds (list): The bounds for the optimization parameters.
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        int: The index of the first feasible sample within `samples`, or None if no sample is feasible.
+    """
+    from scipy.optimize import minimize
+
+    for i, x0 in enumerate(samples):  # tries multiple starting values
+        cons = constraints(context)  # construct constraints for the optimizer
+        result = minimize(objective, x0, args=(context,), method="SLSQP", jac=objective_jac, bounds=bounds,
+                          constraints=cons)  # optimization
+        context.instrumentation.count("slsqp_solves")
+        context.instrumentation.count("slsqp_iterations", result.nit)
 
         if result.success:
-            print("\n\tStarting value found.")
-            return x0  # return the feasible starting value
-        else:
-            tries = tries + 1
-            if (np.mod(tries, 40) == 0):
-                print('.', end='')
+            return i
+        elif np.mod(offset + i + 2, 40) == 0:
+            print('.', end='', flush=True)
 
-    print(f"\n\tNo starting value found after {num_samples} samples.")
-    exit(-1)
+    return None
 
 
-def constraints(x):
+def findStartingValueParallel(samples, bounds, workers, context, chunkSize=8):
     """
-    Constructs constraints for the optimization process.
+    Tries the samples as starting values on a pool of processes. The samples are handed out in small chunks in order.
+    As soon as a chunk reports a feasible sample, all chunks after it that have not started yet are cancelled. The
+    chunks before it are still awaited, so the result is always the lowest-index feasible sample, exactly as in the
+    sequential search. With a fixed random seed the result is therefore deterministic.
 
     Parameters:
-        x (list): A list of input parameters for the optimization.
+        samples (np.array): The scaled samples to try as starting values.
+        bounds (list): The bounds for the optimization parameters.
+        workers (int): The number of worker processes.
+        context (SimulationContext): The scenario to optimize. A copy of it is sent along with every chunk.
+        chunkSize (int): The number of samples per task.
+
+    Returns:
+        int: The index of the first feasible sample, or None if no sample is feasible.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    found = None
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(trySamples, samples[start:start + chunkSize], start, bounds, context): start
+                   for start in range(0, len(samples), chunkSize)}
+
+        for future in as_completed(futures):
+            if not future.cancelled() and future.result() is not None:
+                index = futures[future] + future.result()
+                if found is None or index < found:
+                    found = index
+                    for other, start in futures.items():  # cancel all chunks that can only find later samples
+                        if start > found:
+                            other.cancel()
+
+            # stop waiting once every chunk before the found sample is finished
+            if found is not None and all(other.done() for other, start in futures.items() if start < found):
+                break
+
+    return found
+
+
+def constraints(context):
+    """
+    Constructs constraints for the optimization process. Each constraint is evaluated at the optimizer's current
+    parameters and comes with its analytic gradient.
+
+    Parameters:
+        context (SimulationContext): The scenario to optimize.
 
     Returns:
         list: A list of dictionaries representing inequality constraints.
     """
-    g = ineq_constraints(x)  # retrieve constraints
-    cons = [{'type': 'ineq', 'fun': lambda x, g_i=g_i: g_i} for g_i in g]  # add constraints
+    engine = ConstraintEngine(context)  # shared by all constraints, so the forces are built once per x
+    cons = [{'type': 'ineq',
+             'fun': lambda x, i=i: engine.values(x)[i],
+             'jac': lambda x, i=i: engine.jacobian(x)[i]} for i in range(10)]  # add constraints
     return cons
 
 
-def ineq_constraints(x):
+class ConstraintEngine:
+    """
+    Evaluates all inequality constraints and their Jacobian for the constraint callbacks of the optimizer. The optimizer
+    calls every constraint (and every gradient) separately at the same parameters, so the force vectors, the ten
+    constraint values and the Jacobian are computed once per x and cached by the exact bytes of x.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.key = None
+        self.forces = None
+        self.cachedValues = None
+        self.cachedJacobian = None
+
+    def update(self, x):
+        """
+        Builds the force vectors for new parameters and drops the cached results of the previous parameters.
+
+        Parameters:
+            x (list): A list containing the parameters [turnIncline, mass, staticFriction, cdValue, frontArea,
+                atmosphericPressure].
+
+        Returns:
+            None
+        """
+        x = np.asarray(x, dtype=float)
+        key = x.tobytes()
+        if key == self.key:
+            return
+
+        turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure = x
+        self.key = key
+        self.context.instrumentation.count("init_vectors")
+        self.forces = init_vectors(turnIncline, mass, cdValue, frontArea, atmosphericPressure,
+                                   self.context.gasContent, self.context.temperature, self.context.velocity,
+                                   self.context.turnAngle, self.context.gravityAcceleration)
+        self.cachedValues = None
+        self.cachedJacobian = None
+
+    def values(self, x):
+        """
+        Returns the values of all inequality constraints at x.
+
+        Parameters:
+            x (list): A list containing the parameters [turnIncline, mass, staticFriction, cdValue, frontArea,
+                atmosphericPressure].
+
+        Returns:
+            list: A list of inequality constraints.
+        """
+        self.context.instrumentation.count("constraint")
+        self.update(x)
+        if self.cachedValues is None:
+            self.cachedValues = ineq_constraints(x, self.context, self.forces)
+        return self.cachedValues
+
+    def jacobian(self, x):
+        """
+        Returns the Jacobian of all inequality constraints at x.
+
+        Parameters:
+            x (list): A list containing the parameters [turnIncline, mass, staticFriction, cdValue, frontArea,
+                atmosphericPressure].
+
+        Returns:
+            np.array: A (10, 6) array with the gradient of each inequality constraint.
+        """
+        self.context.instrumentation.count("constraint_jac")
+        self.update(x)
+        if self.cachedJacobian is None:
+            self.cachedJacobian = ineq_constraints_jac(x, self.context, self.forces)
+        return self.cachedJacobian
+
+
+def ineq_constraints(x, context, forces=None):
     """
     Defines inequality constraints for the optimization process based on input parameters. Uses the inaccuracy tolerance
     value to speed up the optimization and allow slight inperfections.
@@ -154,6 +491,8 @@ def ineq_constraints(x):
 
     Parameters:
         x (list): A list containing the parameters [turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
+        forces (tuple): The force vectors from `init_vectors` for x. Built from x if not given.
 
     Returns:
         list: A list of inequality constraints.
@@ -161,53 +500,55 @@ def ineq_constraints(x):
     turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure = x
 
     # get forces
+    if forces is None:
+        context.instrumentation.count("init_vectors")
+        forces = init_vectors(turnIncline, mass, cdValue, frontArea, atmosphericPressure, context.gasContent,
+                              context.temperature, context.velocity, context.turnAngle,
+                              context.gravityAcceleration)
     (f_drag, f_velocity, f_new_velocity, f_centrifugal, f_gravity, f_gravity_parallel, f_neutral, f_road,
-     f_static_friction, f_centripetal) = (
-        init_vectors(turnIncline, mass, cdValue, frontArea, atmosphericPressure, variables.gasContent,
-                     variables.temperature, variables.velocity, variables.turnAngle, variables.gravityAcceleration)
-    )
+     f_static_friction, f_centripetal) = forces
 
     # |f_static_friction| = |f_neutral| * staticFriction
     constraint0 = np.linalg.norm(f_static_friction) - np.linalg.norm(f_neutral) * staticFriction
-    tolerance0 = np.linalg.norm(f_static_friction) * variables.inaccuracyTolerance
+    tolerance0 = np.linalg.norm(f_static_friction) * context.inaccuracyTolerance
 
     # f_centripetal = f_gravity_parallel + f_static_friction
     constraint1 = np.linalg.norm(f_centripetal) - np.linalg.norm(
         np.array(f_gravity_parallel) + np.array(f_static_friction))
-    tolerance1 = np.linalg.norm(f_centripetal) * variables.inaccuracyTolerance
+    tolerance1 = np.linalg.norm(f_centripetal) * context.inaccuracyTolerance
 
     # f_road = -f_neutral
     constraint2 = np.linalg.norm(np.array(f_road) + np.array(f_neutral))
-    tolerance2 = np.linalg.norm(f_road) * variables.inaccuracyTolerance
+    tolerance2 = np.linalg.norm(f_road) * context.inaccuracyTolerance
 
     # |f_velocity| = |f_new_velocity|
     constraint3 = np.linalg.norm(f_velocity) - np.linalg.norm(f_new_velocity)
-    tolerance3 = np.linalg.norm(f_velocity) * variables.inaccuracyTolerance
+    tolerance3 = np.linalg.norm(f_velocity) * context.inaccuracyTolerance
 
     # f_velocity = -f_drag
     constraint4 = np.linalg.norm(np.array(f_velocity) + np.array(f_drag))
-    tolerance4 = np.linalg.norm(f_velocity) * variables.inaccuracyTolerance
+    tolerance4 = np.linalg.norm(f_velocity) * context.inaccuracyTolerance
 
     # f_velocity = f_new_velocity + f_centrifugal
     constraint5 = np.linalg.norm(np.array(f_velocity) - np.array(f_new_velocity) - np.array(f_centrifugal))
-    tolerance5 = np.linalg.norm(f_velocity) * variables.inaccuracyTolerance
+    tolerance5 = np.linalg.norm(f_velocity) * context.inaccuracyTolerance
 
     # f_gravity = f_neutral + f_gravity_parallel
     constraint6 = np.linalg.norm(np.array(f_gravity) - np.array(f_neutral) - np.array(f_gravity_parallel))
-    tolerance6 = np.linalg.norm(f_gravity) * variables.inaccuracyTolerance
+    tolerance6 = np.linalg.norm(f_gravity) * context.inaccuracyTolerance
 
     # f_centripetal = -f_centrifugal
     constraint7 = np.linalg.norm(np.array(f_centripetal) + np.array(f_centrifugal))
-    tolerance7 = np.linalg.norm(f_centripetal) * variables.inaccuracyTolerance
+    tolerance7 = np.linalg.norm(f_centripetal) * context.inaccuracyTolerance
 
     # f_new_velocity = transform_vector(transform_vector(f_velocity, 0, turnAngle, 0), 0, 0, turnIncline)
     constraint8 = np.linalg.norm(np.array(f_new_velocity) - np.array(transform_vector(np.array(transform_vector(
-        np.array(f_velocity), 0, np.radians(variables.turnAngle), 0)), 0, 0, np.radians(turnIncline))))
-    tolerance8 = np.linalg.norm(f_new_velocity) * variables.inaccuracyTolerance
+        np.array(f_velocity), 0, np.radians(context.turnAngle), 0)), 0, 0, np.radians(turnIncline))))
+    tolerance8 = np.linalg.norm(f_new_velocity) * context.inaccuracyTolerance
 
     # arctan(f_gravity_parallel(y) / f_gravity_parallel(x)) = turnIncline
     constraint9 = np.arctan(f_gravity_parallel[1] / f_gravity_parallel[0]) - np.radians(turnIncline)
-    tolerance9 = np.arctan(f_gravity_parallel[1] / f_gravity_parallel[0]) * variables.inaccuracyTolerance
+    tolerance9 = np.arctan(f_gravity_parallel[1] / f_gravity_parallel[0]) * context.inaccuracyTolerance
 
     # inequality constraints g(x) >= 0 (conditions must be more than or equal to 0 to succeed)
     ineq_constraints = [
@@ -225,36 +566,316 @@ def ineq_constraints(x):
     return ineq_constraints
 
 
-def objective(x):
+def ineq_constraints_jac(x, context, forces=None):
+    """
+    Calculates the analytic Jacobian of `ineq_constraints`. The derivatives of all force vectors are carried along
+    (forward mode) through the same steps as in `init_vectors`, and the norms, differences and the arctangent of the
+    constraints are differentiated from them. The absolute values are differentiated with the sign of their argument.
+
+    Parameters:
+        x (list): A list containing the parameters [turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
+        forces (tuple): The force vectors from `init_vectors` for x. Built from x if not given.
+
+    Returns:
+        np.array: A (10, 6) array with the gradient of each inequality constraint.
+
+    Formula:
+        - d|v|/dx = v @ dv/dx / |v|
+        - d/dx R_z(turnIncline) @ v = R_z'(turnIncline) @ v * dturnIncline/dx + R_z(turnIncline) @ dv/dx
+        - dg_i/dx = -sign(constraint_i) * dconstraint_i/dx + inaccuracyTolerance * dtolerance_i/dx
+    """
+    turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure = x
+    incline = np.radians(turnIncline)
+    dIncline = np.array([np.radians(1), 0, 0, 0, 0, 0])  # turnIncline is given in degrees
+
+    # get forces
+    if forces is None:
+        context.instrumentation.count("init_vectors")
+        forces = init_vectors(turnIncline, mass, cdValue, frontArea, atmosphericPressure, context.gasContent,
+                              context.temperature, context.velocity, context.turnAngle,
+                              context.gravityAcceleration)
+    (f_drag, f_velocity, f_new_velocity, f_centrifugal, f_gravity, f_gravity_parallel, f_neutral, f_road,
+     f_static_friction, f_centripetal) = forces
+
+    # derivatives (3, 6) of the force vectors, following init_vectors step by step
+    airDensityFactor = get_airDensity(1, context.temperature, context.gasContent)
+    d_drag = np.zeros((3, 6))
+    d_drag[2, 3] = 0.5 * airDensityFactor * atmosphericPressure * frontArea * context.velocity ** 2
+    d_drag[2, 4] = 0.5 * airDensityFactor * atmosphericPressure * cdValue * context.velocity ** 2
+    d_drag[2, 5] = 0.5 * airDensityFactor * cdValue * frontArea * context.velocity ** 2
+
+    d_velocity = transform_vector(d_drag.T, 0, np.radians(180), 0).T
+
+    turned = transform_vector(f_velocity, 0, np.radians(context.turnAngle), 0)
+    d_turned = transform_vector(d_velocity.T, 0, np.radians(context.turnAngle), 0).T
+    d_new_velocity = (transform_vector(d_turned.T, 0, 0, incline).T
+                      + np.outer(roll_derivative(turned, incline), dIncline))
+
+    d_centrifugal = d_velocity - d_new_velocity
+
+    d_gravity = np.zeros((3, 6))
+    d_gravity[1, 1] = -1 * context.gravityAcceleration
+    d_gravityNorm = norm_gradient(f_gravity, d_gravity)
+
+    parallel = np.array([0, -1 * np.linalg.norm(f_gravity) * np.sin(incline), 0])
+    d_parallel = np.zeros((3, 6))
+    d_parallel[1] = -1 * (d_gravityNorm * np.sin(incline) + np.linalg.norm(f_gravity) * np.cos(incline) * dIncline)
+    d_gravity_parallel = (transform_vector(d_parallel.T, 0, 0, np.radians(270 + turnIncline)).T
+                          + np.outer(roll_derivative(parallel, np.radians(270 + turnIncline)), dIncline))
+
+    neutral = np.array([0, -1 * np.linalg.norm(f_gravity) * np.cos(incline), 0])
+    d_neutral_ = np.zeros((3, 6))
+    d_neutral_[1] = -1 * (d_gravityNorm * np.cos(incline) - np.linalg.norm(f_gravity) * np.sin(incline) * dIncline)
+    d_neutral = (transform_vector(d_neutral_.T, 0, 0, incline).T
+                 + np.outer(roll_derivative(neutral, incline), dIncline))
+
+    d_road = transform_vector(d_neutral.T, 0, 0, np.radians(180)).T
+    d_static_friction = (d_centrifugal * -1) - d_gravity_parallel
+    d_centripetal = d_centrifugal * -1
+
+    # f_new_velocity as recomputed in constraint 8
+    recomputed = transform_vector(transform_vector(f_velocity, 0, np.radians(context.turnAngle), 0), 0, 0, incline)
+
+    # constraint values and gradients in the same order as in ineq_constraints
+    constraint = np.empty(10)
+    d_constraint = np.empty((10, 6))
+    d_tolerance = np.empty((10, 6))
+
+    # |f_static_friction| = |f_neutral| * staticFriction
+    constraint[0] = np.linalg.norm(f_static_friction) - np.linalg.norm(f_neutral) * staticFriction
+    d_constraint[0] = (norm_gradient(f_static_friction, d_static_friction)
+                       - norm_gradient(f_neutral, d_neutral) * staticFriction)
+    d_constraint[0, 2] -= np.linalg.norm(f_neutral)
+    d_tolerance[0] = norm_gradient(f_static_friction, d_static_friction)
+
+    # f_centripetal = f_gravity_parallel + f_static_friction
+    constraint[1] = np.linalg.norm(f_centripetal) - np.linalg.norm(f_gravity_parallel + f_static_friction)
+    d_constraint[1] = (norm_gradient(f_centripetal, d_centripetal)
+                       - norm_gradient(f_gravity_parallel + f_static_friction, d_gravity_parallel + d_static_friction))
+    d_tolerance[1] = norm_gradient(f_centripetal, d_centripetal)
+
+    # f_road = -f_neutral
+    constraint[2] = np.linalg.norm(f_road + f_neutral)
+    d_constraint[2] = norm_gradient(f_road + f_neutral, d_road + d_neutral)
+    d_tolerance[2] = norm_gradient(f_road, d_road)
+
+    # |f_velocity| = |f_new_velocity|
+    constraint[3] = np.linalg.norm(f_velocity) - np.linalg.norm(f_new_velocity)
+    d_constraint[3] = norm_gradient(f_velocity, d_velocity) - norm_gradient(f_new_velocity, d_new_velocity)
+    d_tolerance[3] = norm_gradient(f_velocity, d_velocity)
+
+    # f_velocity = -f_drag
+    constraint[4] = np.linalg.norm(f_velocity + f_drag)
+    d_constraint[4] = norm_gradient(f_velocity + f_drag, d_velocity + d_drag)
+    d_tolerance[4] = norm_gradient(f_velocity, d_velocity)
+
+    # f_velocity = f_new_velocity + f_centrifugal
+    constraint[5] = np.linalg.norm(f_velocity - f_new_velocity - f_centrifugal)
+    d_constraint[5] = norm_gradient(f_velocity - f_new_velocity - f_centrifugal,
+                                    d_velocity - d_new_velocity - d_centrifugal)
+    d_tolerance[5] = norm_gradient(f_velocity, d_velocity)
+
+    # f_gravity = f_neutral + f_gravity_parallel
+    constraint[6] = np.linalg.norm(f_gravity - f_neutral - f_gravity_parallel)
+    d_constraint[6] = norm_gradient(f_gravity - f_neutral - f_gravity_parallel,
+                                    d_gravity - d_neutral - d_gravity_parallel)
+    d_tolerance[6] = d_gravityNorm
+
+    # f_centripetal = -f_centrifugal
+    constraint[7] = np.linalg.norm(f_centripetal + f_centrifugal)
+    d_constraint[7] = norm_gradient(f_centripetal + f_centrifugal, d_centripetal + d_centrifugal)
+    d_tolerance[7] = norm_gradient(f_centripetal, d_centripetal)
+
+    # f_new_velocity = transform_vector(transform_vector(f_velocity, 0, turnAngle, 0), 0, 0, turnIncline)
+    constraint[8] = np.linalg.norm(f_new_velocity - recomputed)
+    d_constraint[8] = norm_gradient(f_new_velocity - recomputed, d_new_velocity - d_new_velocity)
+    d_tolerance[8] = norm_gradient(f_new_velocity, d_new_velocity)
+
+    # arctan(f_gravity_parallel(y) / f_gravity_parallel(x)) = turnIncline
+    constraint[9] = np.arctan(f_gravity_parallel[1] / f_gravity_parallel[0]) - incline
+    d_tolerance[9] = ((f_gravity_parallel[0] * d_gravity_parallel[1] - f_gravity_parallel[1] * d_gravity_parallel[0])
+                      / (f_gravity_parallel[0] ** 2 + f_gravity_parallel[1] ** 2))
+    d_constraint[9] = d_tolerance[9] - dIncline
+
+    # gradients of the inequality constraints g(x) = (|constraint| - tolerance) * (-1)
+    return (np.sign(constraint)[:, None] * d_constraint - d_tolerance * context.inaccuracyTolerance) * (-1)
+
+
+def norm_gradient(vector, d_vector):
+    """
+    Calculates the gradient of the norm of a vector from the derivatives of its components. The norm of a zero vector
+    is treated as having a zero gradient.
+
+    Parameters:
+        vector (np.array): The vector.
+        d_vector (np.array): The (3, 6) derivatives of the vector components with respect to the parameters.
+
+    Returns:
+        np.array: The gradient of |vector| with respect to the parameters.
+
+    Formula:
+        d|v|/dx = v @ dv/dx / |v|
+    """
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return np.zeros(d_vector.shape[1])
+    return vector @ d_vector / norm
+
+
+def roll_derivative(vector, roll):
+    """
+    Calculates the derivative of a vector rotated around the z-axis (roll) with respect to the rotation angle.
+
+    Parameters:
+        vector (np.array): The vector before the rotation.
+        roll (float): The roll rotation angle (in radians).
+
+    Returns:
+        np.array: The derivative of R_z(roll) @ vector with respect to roll.
+
+    Formula:
+        d/droll R_z(roll) @ v = [-sin(roll) * x - cos(roll) * y, cos(roll) * x - sin(roll) * y, 0]
+    """
+    return np.array([-np.sin(roll) * vector[0] - np.cos(roll) * vector[1],
+                     np.cos(roll) * vector[0] - np.sin(roll) * vector[1],
+                     0])
+
+
+def ineq_constraints_batch(samples, context):
+    """
+    Evaluates the inequality constraints of `ineq_constraints` for many parameter sets at once.
+
+    Parameters:
+        samples (np.array): An (N, 6) array with the rows [turnIncline, mass, staticFriction, cdValue, frontArea,
+            atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: An (N, 10) array with the values of the inequality constraints for each row.
+    """
+    samples = np.atleast_2d(samples)
+    turnIncline = samples[:, 0]
+    staticFriction = samples[:, 2]
+
+    # get forces
+    forces = init_vectors_batch(samples, context.gasContent, context.temperature, context.velocity,
+                                context.turnAngle, context.gravityAcceleration)
+    (f_drag, f_velocity, f_new_velocity, f_centrifugal, f_gravity, f_gravity_parallel, f_neutral, f_road,
+     f_static_friction, f_centripetal) = (forces[:, i] for i in range(10))
+
+    def norm(vector):
+        return np.linalg.norm(vector, axis=1)
+
+    # constraints and tolerances in the same order as in ineq_constraints
+    constraint = np.empty((len(samples), 10))
+    tolerance = np.empty((len(samples), 10))
+
+    constraint[:, 0] = norm(f_static_friction) - norm(f_neutral) * staticFriction
+    tolerance[:, 0] = norm(f_static_friction)
+    constraint[:, 1] = norm(f_centripetal) - norm(f_gravity_parallel + f_static_friction)
+    tolerance[:, 1] = norm(f_centripetal)
+    constraint[:, 2] = norm(f_road + f_neutral)
+    tolerance[:, 2] = norm(f_road)
+    constraint[:, 3] = norm(f_velocity) - norm(f_new_velocity)
+    tolerance[:, 3] = norm(f_velocity)
+    constraint[:, 4] = norm(f_velocity + f_drag)
+    tolerance[:, 4] = norm(f_velocity)
+    constraint[:, 5] = norm(f_velocity - f_new_velocity - f_centrifugal)
+    tolerance[:, 5] = norm(f_velocity)
+    constraint[:, 6] = norm(f_gravity - f_neutral - f_gravity_parallel)
+    tolerance[:, 6] = norm(f_gravity)
+    constraint[:, 7] = norm(f_centripetal + f_centrifugal)
+    tolerance[:, 7] = norm(f_centripetal)
+    constraint[:, 8] = norm(f_new_velocity - transform_vector(transform_vector(
+        f_velocity, 0, np.radians(context.turnAngle), 0), 0, 0, np.radians(turnIncline)))
+    tolerance[:, 8] = norm(f_new_velocity)
+    with np.errstate(divide='ignore', invalid='ignore'):  # a flat road has no parallel gravity force
+        constraint[:, 9] = np.arctan(f_gravity_parallel[:, 1] / f_gravity_parallel[:, 0]) - np.radians(turnIncline)
+        tolerance[:, 9] = np.arctan(f_gravity_parallel[:, 1] / f_gravity_parallel[:, 0])
+
+    # inequality constraints g(x) >= 0
+    return (np.abs(constraint) - tolerance * context.inaccuracyTolerance) * (-1)
+
+
+def objective(x, context):
     """
     Defines the objective function for the optimization, which is a weighted sum of penalties.
 
     Parameters:
         x (list): A list of input parameters [turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
 
     Returns:
         float: The total penalty value to be minimized.
     """
+    context.instrumentation.count("objective")
     turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure = x
 
     # weighting factors for each parameter (higher weights give more priority)
 
     # penalties for each parameter (minimizing)
-    mass_penalty = variables.weight_mass * mass
-    staticFriction_penalty = variables.weight_staticFriction * staticFriction
-    turnIncline_penalty = variables.weight_turnIncline * turnIncline
-    cdValue_penalty = variables.weight_cdValue * cdValue
-    frontArea_penalty = variables.weight_frontArea * frontArea
-    atmosphericPressure_penalty = variables.weight_atmosphericPressure * atmosphericPressure
+    mass_penalty = context.weight_mass * mass
+    staticFriction_penalty = context.weight_staticFriction * staticFriction
+    turnIncline_penalty = context.weight_turnIncline * turnIncline
+    cdValue_penalty = context.weight_cdValue * cdValue
+    frontArea_penalty = context.weight_frontArea * frontArea
+    atmosphericPressure_penalty = context.weight_atmosphericPressure * atmosphericPressure
 
     # total objective function is a weighted sum of the penalties
     return (mass_penalty + staticFriction_penalty + turnIncline_penalty + cdValue_penalty + frontArea_penalty +
             atmosphericPressure_penalty)
 
 
-def setOptimizationResults(turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure):
+def objective_jac(x, context):
+    """
+    Calculates the gradient of the objective function. As the objective is a weighted sum of the parameters, the
+    gradient is the vector of weights.
+
+    Parameters:
+        x (list): A list of input parameters [turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: The gradient of the objective function.
+    """
+    context.instrumentation.count("objective_jac")
+    return get_weights(context)
+
+
+def objective_batch(samples, context):
+    """
+    Evaluates the objective function for many parameter sets at once.
+
+    Parameters:
+        samples (np.array): An (N, 6) array with the rows [turnIncline, mass, staticFriction, cdValue, frontArea,
+            atmosphericPressure].
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: The total penalty value of each row.
+    """
+    return np.atleast_2d(samples) @ get_weights(context)
+
+
+def get_weights(context):
+    """
+    Collects the weighting factors of the objective function in the order of the optimization parameters.
+
+    Parameters:
+        context (SimulationContext): The scenario to optimize.
+
+    Returns:
+        np.array: The weights [turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure].
+    """
+    return np.array([context.weight_turnIncline, context.weight_mass, context.weight_staticFriction,
+                     context.weight_cdValue, context.weight_frontArea, context.weight_atmosphericPressure],
+                    dtype=float)
+
+
+def setOptimizationResults(turnIncline, mass, staticFriction, cdValue, frontArea, atmosphericPressure, context):
     """
-    Sets the optimization results to global variables.
+    Sets the optimization results to the simulation context.
 
     Parameters:
         turnIncline (float): The turn incline (in degrees).
@@ -263,21 +884,23 @@ def setOptimizationResults(turnIncline, mass, staticFriction, cdValue, frontArea
         cdValue (float): The drag coefficient.
         frontArea (float): The front area of the vehicle (in m²).
         atmosphericPressure (float): The atmospheric pressure (in Pa).
+        context (SimulationContext): The scenario to store the results in.
 
     Returns:
         None
     """
-    # set results to global values
-    variables.turnIncline = turnIncline
-    variables.mass = mass
-    variables.staticFriction = staticFriction
-    variables.cdValue = cdValue
-    variables.frontArea = frontArea
-    variables.atmosphericPressure = atmosphericPressure
-
-    (variables.f_drag, variables.f_velocity, variables.f_new_velocity, variables.f_centrifugal, variables.f_gravity,
-     variables.f_gravity_parallel, variables.f_neutral, variables.f_road, variables.f_static_friction,
-     variables.f_centripetal) = (
-        init_vectors(turnIncline, mass, cdValue, frontArea, atmosphericPressure, variables.gasContent,
-                     variables.temperature, variables.velocity, variables.turnAngle, variables.gravityAcceleration)
+    # set results to the context
+    context.turnIncline = turnIncline
+    context.mass = mass
+    context.staticFriction = staticFriction
+    context.cdValue = cdValue
+    context.frontArea = frontArea
+    context.atmosphericPressure = atmosphericPressure
+
+    context.instrumentation.count("init_vectors")
+    (context.f_drag, context.f_velocity, context.f_new_velocity, context.f_centrifugal, context.f_gravity,
+     context.f_gravity_parallel, context.f_neutral, context.f_road, context.f_static_friction,
+     context.f_centripetal) = (
+        init_vectors(turnIncline, mass, cdValue, frontArea, atmosphericPressure, context.gasContent,
+                     context.temperature, context.velocity, context.turnAngle, context.gravityAcceleration)
     )
\ No newline at end of file
@@ -0,0 +1,34 @@
+import os
+import sys
+
+from control.export import load_trajectory
+
+"""
+Shows a trajectory saved by main.py (see trajectoryFile in the configuration file) without simulating it again.
+The trajectory is memory-mapped, so it can be viewed on another machine than the one it was simulated on.
+
+Usage: python replay.py <trajectory directory> [image or video file]
+If an image file (.png or .svg) is given, the views are written to it instead of being shown in a window. If a video
+file (.gif or .mp4) is given, the animation is exported to it on one process per CPU core.
+"""
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python replay.py <trajectory directory> [image or video file]")
+        exit(-1)
+
+    trajectory, context = load_trajectory(sys.argv[1])
+
+    # initializes views with two graphs. Focuses on the middle dataset, where the current vectors will be displayed
+    if len(sys.argv) == 3 and sys.argv[2].endswith((".gif", ".mp4")):
+        from view.videoView import export_video
+        export_video(trajectory, context, sys.argv[2], os.cpu_count(), sys.argv[1])
+    elif len(sys.argv) == 3:
+        from view.wholeView import render_views
+        render_views(trajectory, int(len(trajectory) / 2), context, sys.argv[2])
+    elif context.animate:
+        from view.animationView import init_animation
+        init_animation(trajectory, context)
+    else:
+        from view.wholeView import init_views
+        init_views(trajectory, int(len(trajectory) / 2), context)
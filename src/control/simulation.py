@@ -1,64 +1,103 @@
 import numpy as np
 
-from control.formulae import get_Coordinates, transform_vector, get_radius, get_circle_circumference
-from model import variables
+from control.formulae import get_Coordinates, get_radius, get_circle_circumference
+from model.trajectory import Trajectory, FORCE_NAMES
 
 
-def simulate():
+def simulate(context):
     """
     Simulates the movement along the curve, calculating forces and coordinates at different points based on the
-    given parameters. The simulation iterates over the curve's total distance and updates the dataset accordingly.
-    Fills a datalist list with all datasets containing the relevant data to demonstrate the movement along the curve.
+    given parameters. The simulation covers the curve's total distance in evenly spaced time steps, which are all
+    calculated at once by `simulate_steps`. Stores the resulting trajectory, containing the relevant data to
+    demonstrate the movement along the curve, in the context.
 
     Parameters:
-        None
+        context (SimulationContext): The optimized scenario to simulate. The result is stored in its trajectory.
 
     Returns:
         None
     """
     print("Simulating values...")
 
-    variables.radius = get_radius(variables.wheelDistance, variables.turnAngle)
-    variables.totalDistance = get_circle_circumference(variables.radius)
+    context.radius = get_radius(context.wheelDistance, context.turnAngle)
+    context.totalDistance = get_circle_circumference(context.radius)
 
-    timePassed = 0
-    simulationTime = variables.totalDistance / variables.velocity
-    deltaT = simulationTime / variables.simulationIterations
-    while timePassed <= simulationTime:
-        data = getDataset(variables.velocity * timePassed)  # retrieve dataset from current position on the curve
-        variables.dataList.append(data)
-        timePassed += deltaT  # increase time
+    context.trajectory = simulate_steps(context)
 
     print("Simulation finished.")
 
 
-def getDataset(distance):
+def simulate_stream(context, chunkSize):
+    """
+    Simulates the movement along the curve like `simulate`, but yields the trajectory in chunks of consecutive steps
+    instead of storing it. Only one chunk exists at a time, so the memory stays bounded by the chunk size no matter how
+    many simulationIterations are configured. The chunks joined together equal the trajectory of `simulate`.
+
+    Parameters:
+        context (SimulationContext): The optimized scenario to simulate.
+        chunkSize (int): The maximum number of steps per chunk.
+
+    Returns:
+        generator: A generator yielding the chunks as Trajectory objects.
     """
-    Retrieves the dataset for a given distance along the curve. The dataset includes various forces and coordinates
-    at that specific point. Rotates vectors according to this formula:
+    print("Simulating values...")
+
+    context.radius = get_radius(context.wheelDistance, context.turnAngle)
+    context.totalDistance = get_circle_circumference(context.radius)
+
+    steps = context.simulationIterations + 1
+    for first in range(0, steps, chunkSize):
+        yield simulate_steps(context, first, min(first + chunkSize, steps))
+
+    print("Simulation finished.")
+
+
+def simulate_steps(context, first=0, last=None):
+    """
+    Calculates time steps of the simulation as whole arrays. The simulation time is split into
+    simulationIterations equal steps, so there are simulationIterations + 1 steps from the start to the end of the
+    curve, of which the steps from `first` up to (excluding) `last` are calculated. The force vectors are rotated
+    according to the current position in the curve whenever they are read from the trajectory:
     - newAngle = (distance * curveAngle) / totalDistance
 
     Parameters:
-        distance (float): The distance along the curve for which the dataset is to be generated.
+        context (SimulationContext): The optimized scenario to simulate, with radius and totalDistance already set.
+        first (int): The index of the first step to calculate.
+        last (int): The index after the last step to calculate. Defaults to all remaining steps.
 
     Returns:
-        list: A list containing a total of 12 elements:
-            - 0: Coordinates at the given distance.
-            - 1: The new angle in relation to the starting point.
-            - 2-11: Various force vectors (e.g., velocity, new velocity, drag, centripetal force, etc.).
+        Trajectory: The points in time, angles (in °), coordinates and force vectors of the steps.
     """
+    if last is None:
+        last = context.simulationIterations + 1
+
+    # same points in time as np.linspace(0, simulationTime, simulationIterations + 1)[first:last]
+    simulationTime = context.totalDistance / context.velocity
+    times = np.arange(first, last) * (simulationTime / context.simulationIterations)
+    if last == context.simulationIterations + 1 and last > first:
+        times[-1] = simulationTime
+    distances = context.velocity * times
+
     # calculate new coordinates
-    coordinates = get_Coordinates(variables.radius, distance, variables.totalDistance, variables.curveAngle,
-                                  variables.turnIncline, variables.roadWidth)
-    # calculate new angle in relation to starting point
-    newAngle = (distance * variables.curveAngle / variables.totalDistance)
+    coordinates = np.empty((len(times), 3))
+    coordinates[:, 0], coordinates[:, 1], coordinates[:, 2] = get_Coordinates(
+        context.radius, distances, context.totalDistance, context.curveAngle, context.turnIncline, context.roadWidth)
+
+    # calculate new angles in relation to starting point
+    angles = distances * context.curveAngle / context.totalDistance
 
-    dataset = [coordinates, newAngle, variables.f_velocity, variables.f_new_velocity, variables.f_drag,
-               variables.f_centripetal, variables.f_centrifugal, variables.f_gravity_parallel,
-               variables.f_static_friction, variables.f_neutral, variables.f_road, variables.f_gravity]
+    vectors = [getattr(context, name) for name in FORCE_NAMES]
+    return Trajectory(times, angles, coordinates, vectors, get_dtype(context))
 
-    # rotates vectors according to current position in the curve
-    for i in range(2, 11):
-        dataset[i] = transform_vector(dataset[i], 0, np.radians(newAngle), 0)
 
-    return dataset
+def get_dtype(context):
+    """
+    Determines the storage precision of the trajectory from the configured trajectoryPrecision.
+
+    Parameters:
+        context (SimulationContext): The scenario to simulate.
+
+    Returns:
+        np.dtype: np.float32 for a precision of 32 bits, np.float64 otherwise.
+    """
+    return np.float32 if context.trajectoryPrecision == 32 else np.float64
@@ -0,0 +1,280 @@
+import contextlib
+import csv
+import io
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+
+from control.validation import validate, get_absolute_path, load_config
+from control.cache import restore_result, store_result
+from control.feasibility import find_infeasibility
+from control.instrumentation import Instrumentation
+from control.optimization import solve, setOptimizationResults
+from control.simulation import simulate
+from model.variables import SimulationContext, configFile, RESULT_NAMES
+
+"""
+Runs the whole simulation for every combination of the environmental parameters that have a sweep range in the
+configuration file, e.g. to find the minimum mass and front area for every velocity and turn angle. The cells of the
+grid are independent, so they are spread over a pool of processes. Nothing is plotted, the results are written to the
+CSV file set by sweepFile.
+
+Usage: python sweep.py
+"""
+
+
+def get_sweep_ranges(path):
+    """
+    Reads the sweep ranges of the environmental parameters from the configuration file. A range is given as
+    [start, stop, count] next to the value of a parameter.
+
+    Parameters:
+        path (str): The absolute file path to the YAML configuration file.
+
+    Returns:
+        dict: The values to sweep for every parameter with a sweep range, in the order of the configuration file.
+
+    Formula:
+        - values = linspace(start, stop, count)
+    """
+    data = load_config(path)
+
+    ranges = {}
+    for param_name, param_details in data["parameters"]["environmental"].items():
+        sweep = param_details.get("sweep")
+        if sweep is not None:
+            start, stop, count = sweep
+            ranges[param_name] = [float(value) for value in np.linspace(start, stop, int(count))]
+    return ranges
+
+
+def get_grid(ranges):
+    """
+    Expands the sweep ranges into all combinations of their values.
+
+    Parameters:
+        ranges (dict): The values to sweep for every parameter.
+
+    Returns:
+        list: A dictionary of parameter values for every cell of the grid.
+    """
+    return [dict(zip(ranges, values)) for values in itertools.product(*ranges.values())]
+
+
+def get_paths(grid):
+    """
+    Splits the grid into paths for the continuation mode. A path contains the cells that only differ in the last swept
+    parameter, ordered by its value, so neighbouring cells of a path are neighbouring scenarios.
+
+    Parameters:
+        grid (list): The values of the swept parameters for every cell, as returned by `get_grid`.
+
+    Returns:
+        list: The cells of every path.
+    """
+    outer = list(grid[0])[:-1]
+    return [list(cells) for _, cells in itertools.groupby(grid, key=lambda cell: [cell[name] for name in outer])]
+
+
+def split_paths(paths, workers):
+    """
+    Splits the paths into segments, so there are at least as many tasks as workers even if there are only a few long
+    paths, e.g. a single one when only one parameter is swept. Every segment starts with a full search for a starting
+    value, so more segments cost more searches; the paths are only split as far as needed to keep all workers busy.
+
+    Parameters:
+        paths (list): The cells of every path, as returned by `get_paths`.
+        workers (int): The number of worker processes.
+
+    Returns:
+        tuple: The cells of every segment, and the index of the path every segment belongs to.
+
+    Formula:
+        - segmentLength <= ceil(cells / workers)
+    """
+    length = max(1, -(-sum(len(path) for path in paths) // workers))
+    segments, pathIndices = [], []
+    for index, path in enumerate(paths):
+        for part in np.array_split(np.arange(len(path)), -(-len(path) // length)):  # segments of equal length
+            segments.append(path[part[0]:part[-1] + 1])
+            pathIndices.append(index)
+    return segments, pathIndices
+
+
+def run_cell(values, context, x0=None):
+    """
+    Validates, optimizes and simulates one cell of the grid. The output of the single steps is suppressed, and a
+    failure is recorded in the result instead of exiting.
+
+    Parameters:
+        values (dict): The values of the swept parameters in this cell.
+        context (SimulationContext): The validated scenario the cell is based on. It is not changed.
+        x0 (list): The optimum of the previous cell of a path, tried as starting value before searching one.
+
+    Returns:
+        dict: The swept values, the optimized parameters, whether the optimization succeeded, the message of the
+            optimizer, whether it started from x0 and the time of every step (in s).
+    """
+    row = dict(values)
+    row.update({name: None for name in RESULT_NAMES})
+    row.update(success=False, message=None, warmStart=False, validateTime=0.0, optimizeTime=0.0, simulateTime=0.0)
+
+    # the grid is already spread over processes, so the starting value search stays in this one
+    context = replace(context, startingValueWorkers=1, instrumentation=Instrumentation(), **values)
+
+    start = time.perf_counter()
+    invalid = [name for name, value in values.items()
+               if name in context.CONSTRAINTS and not
+               context.CONSTRAINTS[name][0] <= value <= context.CONSTRAINTS[name][1]]
+    if invalid:
+        row['message'] = f"Out of range: {', '.join(invalid)}"
+    else:
+        row['message'] = find_infeasibility(context)  # skips cells that can not be solved, instead of searching long
+    row['validateTime'] = time.perf_counter() - start
+    if row['message'] is not None:
+        return row
+
+    start = time.perf_counter()
+    if context.useCache and restore_result(context):
+        row.update(success=True, message="Cached result")
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = solve(context, x0) if x0 is not None else None
+            row['warmStart'] = result is not None and bool(result.success)
+            if not row['warmStart']:  # fall back to searching a starting value
+                result = solve(context)
+
+        row['success'] = result is not None and bool(result.success)
+        row['message'] = "No starting value found" if result is None else str(result.message)
+        if row['success']:
+            setOptimizationResults(*result.x, context)
+            if context.useCache:
+                store_result(context)
+    row['optimizeTime'] = time.perf_counter() - start
+    if not row['success']:
+        return row
+
+    row.update({name: float(getattr(context, name)) for name in RESULT_NAMES})
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulate(context)
+    row['simulateTime'] = time.perf_counter() - start
+
+    return row
+
+
+def run_path(cells, context):
+    """
+    Runs the cells of a path one after another. Every cell starts from the optimum of the last successful cell before
+    it, so small steps along the path need (almost) no search for a starting value.
+
+    Parameters:
+        cells (list): The values of the swept parameters for every cell of the path.
+        context (SimulationContext): The validated scenario all cells are based on.
+
+    Returns:
+        list: The result of every cell of the path.
+    """
+    rows = []
+    x0 = None
+    for values in cells:
+        row = run_cell(values, context, x0)
+        if row['success']:
+            x0 = [row[name] for name in RESULT_NAMES]
+        rows.append(row)
+    return rows
+
+
+def run_sweep(context, grid, workers, continuation=False):
+    """
+    Runs all cells of the grid on a pool of processes and prints the outcome of every cell in the order of the grid.
+    In the continuation mode, segments of the paths are spread over the processes instead of the single cells (see
+    `split_paths`), and every change of the feasibility along a path is reported.
+
+    Parameters:
+        context (SimulationContext): The validated scenario all cells are based on.
+        grid (list): The values of the swept parameters for every cell.
+        workers (int): The number of worker processes. If 1, the cells run in this process.
+        continuation (bool): Whether to run the grid along paths, see `run_path`.
+
+    Returns:
+        list: The result of every cell, in the order of the grid.
+    """
+    print(f"Sweeping {len(grid)} cells...")
+
+    if continuation:
+        tasks, pathIndices = split_paths(get_paths(grid), workers)
+        function = run_path
+    else:
+        tasks, function = grid, run_cell
+    rows = []
+    # the pool is shut down even if a cell raises an error
+    with contextlib.nullcontext() if workers == 1 else ProcessPoolExecutor(max_workers=workers) as executor:
+        results = (map if executor is None else executor.map)(function, tasks, itertools.repeat(context))
+
+        pathStart = 0  # index of the first row of the current path
+        for task, result in enumerate(results):
+            for row in (result if continuation else [result]):
+                values = ", ".join(f"{name}={row[name]:g}" for name in grid[0])
+                print(f"\t{values}: {'success' if row['success'] else row['message']}")
+                rows.append(row)
+
+            # the segments of a path follow each other, so the path is complete once the next task starts another one
+            if continuation and (task + 1 == len(tasks) or pathIndices[task + 1] != pathIndices[task]):
+                print_feasibility_changes(rows[pathStart:], list(grid[0]))
+                pathStart = len(rows)
+
+    print(f"Sweep finished, {sum(row['success'] for row in rows)} of {len(rows)} cells succeeded.")
+    return rows
+
+
+def print_feasibility_changes(rows, names):
+    """
+    Prints where along a path the optimization stops or starts succeeding.
+
+    Parameters:
+        rows (list): The results of the cells of the path.
+        names (list): The names of the swept parameters, the last one is the parameter along the path.
+
+    Returns:
+        None
+    """
+    for previous, row in zip(rows, rows[1:]):
+        if previous['success'] != row['success']:
+            change = "breaks" if previous['success'] else "is restored"
+            print(f"\t\tFeasibility {change} between {names[-1]}={previous[names[-1]]:g} and "
+                  f"{names[-1]}={row[names[-1]]:g}.")
+
+
+def write_results(path, rows):
+    """
+    Writes the results of a sweep to a CSV file with one line per cell.
+
+    Parameters:
+        path (str): The absolute file path to the CSV file.
+        rows (list): The results of the cells.
+
+    Returns:
+        None
+    """
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"Results written to {path}.")
+
+
+if __name__ == '__main__':
+    context = SimulationContext()
+    validate(context)  # checks values for domains, the swept values are checked per cell
+
+    grid = get_grid(get_sweep_ranges(get_absolute_path(configFile)))
+    rows = run_sweep(context, grid, context.sweepWorkers or os.cpu_count(), context.sweepContinuation)
+
+    write_results(get_absolute_path(context.sweepFile), rows)
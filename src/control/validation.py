@@ -1,30 +1,39 @@
 import yaml
 import os
 
-from model import variables
+from model.variables import configFile
 
+# parsed configuration files by their absolute path, with the modification time they were parsed at
+loadedFiles = {}
 
-def validate():
+
+def validate(context, data=None):
     """
     Orchestrates the validation of values by calling the `validate_and_assign_parameters` function.
     This function is an entry point for the validation process.
 
     Parameters:
-        None
+        context (SimulationContext): The scenario to assign the validated values to.
+        data (dict): The parsed configuration of the scenario, e.g. a scenario of a batch. If None, the configuration
+            file is read.
 
     Returns:
         None
     """
     print("Validating values...")
 
-    validate_and_assign_parameters(get_absolute_path(variables.configFile))
+    if data is None:
+        validate_and_assign_parameters(get_absolute_path(configFile), context)
+    else:
+        assign_parameters(data, context)
 
     print("Validation finished.")
 
 
 def get_absolute_path(relative_path):
     """
-    Converts a relative file path to an absolute file path.
+    Converts a relative file path to an absolute file path. The path is relative to the project directory, no matter
+    which directory the program was started from.
 
     Parameters:
         relative_path (str): The relative path of the file to be converted.
@@ -32,34 +41,64 @@ def get_absolute_path(relative_path):
     Returns:
         str: The absolute file path formed by combining the project's directory with the relative path.
     """
-    project_dir = os.path.abspath(os.path.join(os.getcwd(), "../../")) # Project directory
+    project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))  # Project directory
     combined_path = os.path.join(project_dir, relative_path)  # combine two paths
     return os.path.normpath(combined_path)  # get absolute path
 
 
-def validate_and_assign_parameters(path):
+def load_config(path):
+    """
+    Parses a YAML configuration file. The parsed file is kept, and only parsed again once the file was modified, so
+    reading the same file for many scenarios costs a single parse. The result is shared and must not be changed.
+
+    Parameters:
+        path (str): The absolute file path to the YAML configuration file.
+
+    Returns:
+        dict: The parsed configuration.
+    """
+    modified = os.path.getmtime(path)
+    loaded = loadedFiles.get(path)
+    if loaded is None or loaded[0] != modified:
+        with open(path, 'r') as f:
+            loaded = (modified, yaml.safe_load(f) or {})
+        loadedFiles[path] = loaded
+    return loaded[1]
+
+
+def validate_and_assign_parameters(path, context):
     """
-    Validates and assigns values from a YAML configuration file to the `variables` module.
+    Validates and assigns values from a YAML configuration file to the simulation context.
 
     Parameters:
         path (str): The absolute file path to the YAML configuration file.
+        context (SimulationContext): The scenario to assign the validated values to.
+
+    Returns:
+        None
+    """
+    assign_parameters(load_config(path), context)
+
+
+def assign_parameters(data, context):
+    """
+    Validates and assigns the values of a parsed configuration to the simulation context.
+
+    Parameters:
+        data (dict): The parsed configuration, holding the parameters by category.
+        context (SimulationContext): The scenario to assign the validated values to.
 
     Function Logic:
-        - Loads the configuration from the provided YAML file.
         - For each parameter in the configuration:
             - If a range is defined, validates if the value falls within the range.
-            - If the value is valid, assigns the value to the `variables` module.
-            - If no range is defined, assigns the value directly to the `variables` module.
-        - The range values (if provided) are added to the `variables.CONSTRAINTS` dictionary.
+            - If the value is valid, assigns the value to the context.
+            - If no range is defined, assigns the value directly to the context.
+        - The range values (if provided) are added to the `context.CONSTRAINTS` dictionary.
         - Outputs the final `CONSTRAINTS` dictionary after all validations.
 
     Example of validation:
         If the `value` is `50` and `range_` is `(0, 100)`, then `50` is valid.
     """
-    # load the file
-    with open(path, 'r') as f:
-        data = yaml.safe_load(f)
-
     parameters = data.get("parameters", {})
 
     for category, items in parameters.items():
@@ -70,18 +109,18 @@ def validate_and_assign_parameters(path):
 
             # add the range to constraints if defined
             if range_ is not None:
-                variables.CONSTRAINTS[param_name] = tuple(range_)  # Add to the constraints dictionary
+                context.CONSTRAINTS[param_name] = tuple(range_)  # Add to the constraints dictionary
 
             # skip validation if range is not defined
             if range_ is None:
                 print(f"\t\t{param_name}: Skipping validation (no range). Assigned value: {value}")
-                setattr(variables, param_name, value)  # Assign to variables module dynamically
+                setattr(context, param_name, value)  # Assign to the context dynamically
                 continue
 
             # validate value against range
             if value is not None and range_[0] <= value <= range_[1]:
                 print(f"\t\t{param_name}: Valid. Assigned value: {value}")
-                setattr(variables, param_name, value)  # Assign to variables module dynamically
+                setattr(context, param_name, value)  # Assign to the context dynamically
             elif value is not None:
                 print(f"\t\t{param_name}: Invalid. Value {value} out of range {range_}.")
             else:
@@ -89,4 +128,4 @@ def validate_and_assign_parameters(path):
 
     # print the populated CONSTRAINTS dictionary
     print("\tFinal CONSTRAINTS dictionary:")
-    print(f"\t\t{variables.CONSTRAINTS}")
+    print(f"\t\t{context.CONSTRAINTS}")
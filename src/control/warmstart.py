@@ -0,0 +1,119 @@
+import os
+import threading
+
+import numpy as np
+
+from control.validation import get_absolute_path
+from model.variables import RESULT_NAMES
+
+# inputs that span the space the nearest solved scenarios are searched in
+INPUT_NAMES = ('turnAngle', 'velocity', 'temperature', 'gravityAcceleration', 'gasContent')
+# file within the cache directory holding the solved scenarios
+INDEX_FILE = "solutions.npz"
+# maximum number of solved scenarios kept, the oldest ones are dropped first
+MAX_SOLUTIONS = 10000
+
+# KD-tree of every index file read by this process, reused as long as the file and the scaling do not change
+loadedIndex = {}
+# guards loadedIndex, so contexts optimized on several threads never read a half-built or foreign index
+loadedIndexLock = threading.Lock()
+
+
+def add_solution(context):
+    """
+    Appends an optimized scenario to the index of solved scenarios in the cache directory. The index is written to a
+    temporary file first and then renamed, so parallel processes never read an incomplete index. If two processes add a
+    solution at the same time, one of the two may be lost, which only costs a possible starting value.
+
+    Parameters:
+        context (SimulationContext): The optimized scenario.
+
+    Returns:
+        None
+    """
+    path = os.path.join(get_absolute_path(context.cacheDirectory), INDEX_FILE)
+    inputs, solutions = load_solutions(path)
+
+    inputs = np.vstack((inputs, [[getattr(context, name) for name in INPUT_NAMES]]))[-MAX_SOLUTIONS:]
+    solutions = np.vstack((solutions, [[getattr(context, name) for name in RESULT_NAMES]]))[-MAX_SOLUTIONS:]
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        np.savez(f, inputs=inputs, solutions=solutions)
+    os.replace(temporary, path)
+
+
+def load_solutions(path):
+    """
+    Reads the index of solved scenarios.
+
+    Parameters:
+        path (str): The absolute path of the index file.
+
+    Returns:
+        tuple: The (M, 5) inputs and the (M, 6) optimized parameters of the solved scenarios. Both are empty if there is
+            no index yet.
+    """
+    try:
+        with np.load(path) as index:
+            return index['inputs'], index['solutions']
+    except (OSError, KeyError, ValueError):
+        return np.empty((0, len(INPUT_NAMES))), np.empty((0, len(RESULT_NAMES)))
+
+
+def nearest_solutions(context, k):
+    """
+    Finds the optimized parameters of the k solved scenarios whose inputs are closest to the scenario. Every input is
+    scaled by the width of its range, so e.g. 1 m/s and 1 °C count according to their share of the valid values.
+
+    Parameters:
+        context (SimulationContext): The scenario to optimize.
+        k (int): The maximum number of solutions to return.
+
+    Returns:
+        np.array: Up to k optimized parameters, ordered from the closest scenario to the farthest.
+
+    Formula:
+        - distance = || (inputs - query) / (max - min) ||
+    """
+    path = os.path.join(get_absolute_path(context.cacheDirectory), INDEX_FILE)
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except OSError:
+        return np.empty((0, len(RESULT_NAMES)))
+
+    scale = tuple(get_range_width(name, context) for name in INPUT_NAMES)
+    with loadedIndexLock:
+        loaded = loadedIndex.get(path)
+        if loaded is None or loaded[0] != (modified, scale):
+            from scipy.spatial import cKDTree  # imported here, so runs without solved scenarios do not load scipy
+
+            inputs, solutions = load_solutions(path)
+            loaded = ((modified, scale), cKDTree(inputs / scale) if len(inputs) else None, solutions)
+            loadedIndex[path] = loaded
+
+    _, tree, solutions = loaded
+    if tree is None:
+        return solutions
+
+    query = np.array([getattr(context, name) for name in INPUT_NAMES]) / scale
+    _, indices = tree.query(query, k=min(k, len(solutions)))
+    return solutions[np.atleast_1d(indices)]
+
+
+def get_range_width(name, context):
+    """
+    Returns the width of the valid range of an input, or 1 if the input has no range or a single valid value.
+
+    Parameters:
+        name (str): The name of the input.
+        context (SimulationContext): The scenario providing the constraints.
+
+    Returns:
+        float: The width of the range.
+    """
+    range_ = context.CONSTRAINTS.get(name)
+    if range_ is None or range_[1] <= range_[0]:
+        return 1.0
+    return float(range_[1] - range_[0])
@@ -0,0 +1,97 @@
+import numpy as np
+
+from control.formulae import transform_vector
+
+# names of the force vectors, in the order of the datasets
+FORCE_NAMES = ('f_velocity', 'f_new_velocity', 'f_drag', 'f_centripetal', 'f_centrifugal', 'f_gravity_parallel',
+               'f_static_friction', 'f_neutral', 'f_road', 'f_gravity')
+
+
+class Trajectory:
+    """
+    Holds the result of a simulation in contiguous arrays, one entry per time step. Only the points in time, the angles
+    and the positions are stored per step. The force vectors only depend on the angle, so they are stored once and
+    rotated on access. Slicing a trajectory returns a new trajectory that shares the arrays of the original one.
+    """
+    __slots__ = ('times', 'angles', 'positions', 'vectors')
+
+    def __init__(self, times, angles, positions, vectors, dtype=np.float64):
+        """
+        Creates a trajectory from the arrays of a simulation.
+
+        Parameters:
+            times (np.array): The (N,) points in time of the steps (in s).
+            angles (np.array): The (N,) angles in relation to the starting point (in °).
+            positions (np.array): The (N, 3) coordinates of the car.
+            vectors (np.array): The (10, 3) force vectors at the starting point, ordered like `FORCE_NAMES`.
+            dtype (np.dtype): The storage precision, np.float64 or np.float32. Arrays already stored with this
+                precision are not copied.
+
+        Returns:
+            None
+        """
+        self.times = np.asarray(times, dtype=dtype)
+        self.angles = np.asarray(angles, dtype=dtype)
+        self.positions = np.asarray(positions, dtype=dtype)
+        self.vectors = np.asarray(vectors, dtype=dtype)
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, key):
+        """
+        Selects steps of the trajectory. Slices share the arrays of this trajectory, an integer selects a single step
+        as a trajectory of length one.
+
+        Parameters:
+            key (int or slice): The steps to select.
+
+        Returns:
+            Trajectory: The selected steps.
+        """
+        if isinstance(key, (int, np.integer)):
+            key = range(len(self))[key]  # resolves negative indices and checks the bounds
+            key = slice(key, key + 1)
+        return Trajectory(self.times[key], self.angles[key], self.positions[key], self.vectors, self.dtype)
+
+    @property
+    def dtype(self):
+        """
+        The storage precision of the trajectory.
+        """
+        return self.times.dtype
+
+    @property
+    def nbytes(self):
+        """
+        The number of bytes used by the arrays of the trajectory.
+        """
+        return self.times.nbytes + self.angles.nbytes + self.positions.nbytes + self.vectors.nbytes
+
+    def force(self, name):
+        """
+        Returns a force vector for every step, rotated according to the position in the curve. The gravity force
+        points downwards everywhere and is not rotated.
+
+        Parameters:
+            name (str): The name of the force vector, one of `FORCE_NAMES`.
+
+        Returns:
+            np.array: The (N, 3) force vectors.
+
+        Formula:
+            - transform_vector(vector, 0, radians(angle), 0)
+        """
+        vector = self.vectors[FORCE_NAMES.index(name)]
+        if name == 'f_gravity':
+            return np.broadcast_to(vector, (len(self), 3))
+        return transform_vector(vector, 0, np.radians(self.angles), 0).astype(self.dtype, copy=False)
+
+    @property
+    def forces(self):
+        """
+        All force vectors of every step as an (N, 10, 3) array, ordered like `FORCE_NAMES`.
+        """
+        rotated = transform_vector(np.broadcast_to(self.vectors[:-1], (len(self), 9, 3)), 0, np.radians(self.angles), 0)
+        gravity = np.broadcast_to(self.vectors[-1], (len(self), 1, 3))
+        return np.concatenate((rotated, gravity), axis=1).astype(self.dtype, copy=False)
@@ -1,46 +1,84 @@
+from dataclasses import dataclass, field
+
+from control.instrumentation import Instrumentation
+from model.trajectory import Trajectory
+
 # Config file path
 configFile = "./config.yaml"
 
-# Declare variables
-turnAngle = None
-velocity = None
-wheelDistance = None
-temperature = None
-gravityAcceleration = None
-gasContent = None
-roadWidth = None
-mass = None
-staticFriction = None
-cdValue = None
-frontArea = None
-turnIncline = None
-atmosphericPressure = None
-simulationIterations = None
-functionT = None
-inaccuracyTolerance = None
-curveAngle = None
+# optimized parameters, in the order of the optimizer
+RESULT_NAMES = ('turnIncline', 'mass', 'staticFriction', 'cdValue', 'frontArea', 'atmosphericPressure')
+
+
+@dataclass(slots=True)
+class SimulationContext:
+    """
+    Holds the complete state of one scenario: the parameters read from the configuration file, their constraints, the
+    optimized values, the resulting force vectors and the simulated datasets. A context is passed explicitly through
+    validation, optimization, simulation and the views, so several scenarios can run side by side in one process.
+    """
+    # Declare variables
+    turnAngle: float = None
+    velocity: float = None
+    wheelDistance: float = None
+    temperature: float = None
+    gravityAcceleration: float = None
+    gasContent: float = None
+    roadWidth: float = None
+    mass: float = None
+    staticFriction: float = None
+    cdValue: float = None
+    frontArea: float = None
+    turnIncline: float = None
+    atmosphericPressure: float = None
+    simulationIterations: int = None
+    functionT: int = None
+    inaccuracyTolerance: float = None
+    curveAngle: float = None
+    solver: str = None
+    solverPopulation: int = None
+    solverIterations: int = None
+    screeningCandidates: int = None
+    startingValueWorkers: int = None
+    randomSeed: int = None
+    trajectoryPrecision: int = None
+    trajectoryFile: str = None
+    trajectoryChunkSize: int = None
+    renderFile: str = None
+    reportFile: str = None
+    profileFile: str = None
+    videoFile: str = None
+    videoWorkers: int = None
+    renderPoints: int = None
+    showViews: bool = None
+    animate: bool = None
+    animationFrames: int = None
+    useCache: bool = None
+    cacheDirectory: str = None
+    cacheSize: int = None
+    warmStartNeighbours: int = None
+    sweepFile: str = None
+    sweepWorkers: int = None
+    sweepContinuation: bool = None
 
-weight_mass = None
-weight_staticFriction = None
-weight_turnIncline = None
-weight_cdValue = None
-weight_frontArea = None
-weight_atmosphericPressure = None
-f_drag = None
-f_velocity = None
-f_new_velocity = None
-f_centrifugal = None
-f_gravity = None
-f_gravity_parallel = None
-f_neutral = None
-f_road = None
-f_static_friction = None
-f_centripetal = None
-radius = None
-totalDistance = None
-dataList = []
-simulationIterations = None
-functionT = None
-inaccuracyTolerance = None
-curveAngle = None
-CONSTRAINTS = {}
+    weight_mass: float = None
+    weight_staticFriction: float = None
+    weight_turnIncline: float = None
+    weight_cdValue: float = None
+    weight_frontArea: float = None
+    weight_atmosphericPressure: float = None
+    f_drag: object = None
+    f_velocity: object = None
+    f_new_velocity: object = None
+    f_centrifugal: object = None
+    f_gravity: object = None
+    f_gravity_parallel: object = None
+    f_neutral: object = None
+    f_road: object = None
+    f_static_friction: object = None
+    f_centripetal: object = None
+    radius: float = None
+    totalDistance: float = None
+    trajectory: Trajectory = None
+    CONSTRAINTS: dict = field(default_factory=dict)
+    instrumentation: Instrumentation = field(default_factory=Instrumentation)
@@ -0,0 +1,187 @@
+import numpy as np
+
+from control.formulae import transform_vector
+from view import sideView
+from view import topdownView
+
+# time between two frames of the animation (in ms)
+FRAME_INTERVAL = 33
+
+
+def init_animation(trajectory, context):
+    """
+    Shows an animation of the car traversing the curve, with the side view and the top-down view next to each other.
+    The interactive TkAgg backend is only loaded here, when a window is actually shown.
+
+    Parameters:
+        trajectory (Trajectory): The simulation data for all iterations.
+        context (SimulationContext): The simulated scenario.
+
+    Returns:
+        None
+    """
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plot
+    from matplotlib.animation import FuncAnimation
+
+    fig, (ax1, ax2) = plot.subplots(1, 2, figsize=(10, 5))  # 1 row, 2 columns
+
+    traversal = TraversalAnimation(ax1, ax2, trajectory, context)
+    # the animation is kept referenced by the figure, as it stops once it is garbage collected
+    fig.animation = FuncAnimation(fig, traversal.update, frames=len(traversal), init_func=traversal.init,
+                                  interval=FRAME_INTERVAL, blit=True)
+
+    plot.show()
+
+
+class TraversalAnimation:
+    """
+    Draws the frames of the traversal animation. The road, the axes and the car positions are drawn once. Only the
+    artists of the current position and the force vectors are created, once, and every frame merely moves them and
+    updates their directions, so a frame costs the same no matter how long the trajectory is. The steps are thinned out
+    to at most animationFrames frames.
+    """
+
+    def __init__(self, ax1, ax2, trajectory, context):
+        """
+        Draws the static parts of both views and creates the artists that are updated per frame.
+
+        Parameters:
+            ax1 (matplotlib.axes.Axes): The axes of the side view.
+            ax2 (matplotlib.axes.Axes): The axes of the top-down view.
+            trajectory (Trajectory): The simulation data for all iterations.
+            context (SimulationContext): The simulated scenario.
+
+        Returns:
+            None
+        """
+        self.context = context
+
+        self.steps = trajectory[::get_frame_step(len(trajectory), context.animationFrames)]
+
+        # the force vectors of all frames, as seen from above and, rotated back, from the side
+        self.vectors = self.steps.forces
+        self.sideVectors = transform_vector(self.vectors, 0, np.radians(self.steps.angles * -1), 0)
+
+        topdownView.init_background(ax2, trajectory, context)
+        position = self.steps.positions[0]
+        self.topdownVelocities = ax2.quiver(*np.tile(position[[0, 2]], (5, 1)).T, self.vectors[0, 0:5, 0],
+                                            self.vectors[0, 0:5, 2], angles='xy', scale_units='xy', scale=1,
+                                            color=['red', 'red', 'orange', 'green', 'green'], animated=True)
+        self.topdownForces = ax2.quiver(*np.tile(position[[0, 2]], (2, 1)).T, self.vectors[0, 5:7, 0],
+                                        self.vectors[0, 5:7, 2], angles='xy', scale_units='xy', scale=999,
+                                        color=['purple', 'blue'], animated=True)
+
+        init_side_background(ax1, self.steps, context)
+        self.sideRoad = sideView.add_road(ax1, context.roadWidth, context.turnIncline,
+                                          *sideView.get_road_origin(position, context))
+        self.sidePoint = ax1.scatter(position[0], position[1], color='grey', marker='.', s=400, animated=True)
+        self.sideQuiver = ax1.quiver(*np.tile(position[0:2], (5, 1)).T, self.sideVectors[0, 5:10, 0],
+                                     self.sideVectors[0, 5:10, 1], angles='xy', scale_units='xy', scale=6999,
+                                     color=['purple', 'blue', 'purple', 'yellow', 'purple'], animated=True)
+        for line in self.sideRoad:
+            line.set_animated(True)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def artists(self):
+        """
+        The artists that change from frame to frame.
+        """
+        return [*self.sideRoad, self.sidePoint, self.sideQuiver, self.topdownVelocities, self.topdownForces]
+
+    def init(self):
+        """
+        Shows the first frame, used by FuncAnimation before the animation starts.
+
+        Returns:
+            list: The changed artists.
+        """
+        return self.update(0)
+
+    def update(self, frame):
+        """
+        Moves the position and the force vectors of both views to a frame.
+
+        Parameters:
+            frame (int): The index of the frame.
+
+        Returns:
+            list: The changed artists.
+        """
+        position = self.steps.positions[frame]
+        vectors = self.vectors[frame]
+        sideVectors = self.sideVectors[frame]
+
+        self.topdownVelocities.set_offsets(np.tile(position[[0, 2]], (5, 1)))
+        self.topdownVelocities.set_UVC(vectors[0:5, 0], vectors[0:5, 2])
+        self.topdownForces.set_offsets(np.tile(position[[0, 2]], (2, 1)))
+        self.topdownForces.set_UVC(vectors[5:7, 0], vectors[5:7, 2])
+
+        sides = sideView.get_road(self.context.roadWidth, self.context.turnIncline,
+                                  *sideView.get_road_origin(position, self.context))
+        for line, (xs, ys) in zip(self.sideRoad, sides):
+            line.set_data(xs, ys)
+        self.sidePoint.set_offsets([position[0:2]])
+        self.sideQuiver.set_offsets(np.tile(position[0:2], (5, 1)))
+        self.sideQuiver.set_UVC(sideVectors[5:10, 0], sideVectors[5:10, 1])
+
+        return self.artists()
+
+
+def get_frame_step(steps, maxFrames):
+    """
+    Calculates which steps are shown as frames, so that there are at most maxFrames frames.
+
+    Parameters:
+        steps (int): The number of steps of the trajectory.
+        maxFrames (int): The maximum number of frames. If None, every step is a frame.
+
+    Returns:
+        int: The distance between the steps of two frames.
+
+    Formula:
+        - step = ceil(steps / maxFrames)
+    """
+    if maxFrames and steps > maxFrames:
+        return -(-steps // maxFrames)
+    return 1
+
+
+def init_side_background(plot, trajectory, context):
+    """
+    Initializes the side view for the animation. Unlike the static side view, the range of the axes spans all positions
+    of the traversal, so it does not have to change while the car moves.
+
+    Parameters:
+        plot (matplotlib.axes.Axes): The plot object to which the data will be drawn.
+        trajectory (Trajectory): The steps of the animation.
+        context (SimulationContext): The simulated scenario, providing the road width and incline.
+
+    Returns:
+        None
+
+    Formula:
+        - minX = min(x) - (cos(turnIncline) * roadWidth)
+        - maxX = max(x) + (cos(turnIncline) * roadWidth)
+        - minY = min(y) - (sin(turnIncline) * roadWidth)
+        - maxY = max(y) + (sin(turnIncline) * roadWidth)
+        - centerY = (minY + maxY) / 2
+    """
+    positions = trajectory.positions
+
+    # calculate the range of the axes
+    minX = positions[:, 0].min() - (np.cos(np.radians(context.turnIncline)) * context.roadWidth)
+    maxX = positions[:, 0].max() + (np.cos(np.radians(context.turnIncline)) * context.roadWidth)
+    minY = positions[:, 1].min() - (np.sin(np.radians(context.turnIncline) * context.roadWidth))
+    maxY = positions[:, 1].max() + (np.sin(np.radians(context.turnIncline) * context.roadWidth))
+
+    # initialize graph, widening the y-range to the x-range, so both axes have the same scale in a square plot
+    centerY = (minY + maxY) / 2
+    plot.set_xlim(minX, maxX)
+    plot.set_ylim(centerY - (maxX - minX) / 2, centerY + (maxX - minX) / 2)
+    plot.set_title("Side View")
+    plot.set_ylabel("Y [m]")
+    plot.set_aspect('equal', adjustable='box')
@@ -1,37 +1,38 @@
 import numpy as np
 
 from control.formulae import transform_vector
-from model import variables
 
 
-def init_graph(plot, dataset):
+def init_graph(plot, dataset, context):
     """
     Initializes the graph for simulation visualization. This includes calculating the range of axes, plotting the road
     triangle, setting up the graph's limits, and adding simulation data such as the current position and vectors.
 
     Parameters:
         plot (matplotlib.axes.Axes): The plot object to which the data will be drawn.
-        dataset (list): The simulation dataset, including coordinates and forces at the current position.
+        dataset (Trajectory): The simulation step to show, including coordinates and forces at the current position.
+        context (SimulationContext): The simulated scenario, providing the road width and incline.
 
     Returns:
         None
 
     Formula:
-        - minX = dataset[0][0] - (cos(turnIncline) * roadWidth)
-        - maxX = dataset[0][0] + (cos(turnIncline) * roadWidth)
-        - minY = dataset[0][1] - (sin(turnIncline) * roadWidth)
-        - maxY = dataset[0][1] + (sin(turnIncline) * roadWidth)
+        - minX = position[0] - (cos(turnIncline) * roadWidth)
+        - maxX = position[0] + (cos(turnIncline) * roadWidth)
+        - minY = position[1] - (sin(turnIncline) * roadWidth)
+        - maxY = position[1] + (sin(turnIncline) * roadWidth)
     """
+    position = dataset.positions[0]
+
     # calculate the range of the axes
-    minX = dataset[0][0] - (np.cos(np.radians(variables.turnIncline)) * variables.roadWidth)
-    maxX = dataset[0][0] + (np.cos(np.radians(variables.turnIncline)) * variables.roadWidth)
-    minY = dataset[0][1] - (np.sin(np.radians(variables.turnIncline) * variables.roadWidth))
-    maxY = dataset[0][1] + (np.sin(np.radians(variables.turnIncline) * variables.roadWidth))
+    minX = position[0] - (np.cos(np.radians(context.turnIncline)) * context.roadWidth)
+    maxX = position[0] + (np.cos(np.radians(context.turnIncline)) * context.roadWidth)
+    minY = position[1] - (np.sin(np.radians(context.turnIncline) * context.roadWidth))
+    maxY = position[1] + (np.sin(np.radians(context.turnIncline) * context.roadWidth))
 
     # plots triangle to graph (road)
-    triangleX = dataset[0][0] - (np.cos(np.radians(variables.turnIncline)) * variables.roadWidth / 2)
-    triangleY = dataset[0][1] - (np.sin(np.radians(variables.turnIncline) * variables.roadWidth / 2))
-    add_road(plot, variables.roadWidth, variables.turnIncline, triangleX, triangleY)
+    triangleX, triangleY = get_road_origin(position, context)
+    add_road(plot, context.roadWidth, context.turnIncline, triangleX, triangleY)
 
     # initialize graph
     plot.set_xlim(minX, maxX)
@@ -42,11 +43,31 @@ def init_graph(plot, dataset):
     plot.autoscale(True)
 
     # add relevant simulation data
-    origin = [dataset[0][0], dataset[0][1]]
+    origin = [position[0], position[1]]
     add_point(plot, origin)
     add_vectors(plot, dataset, origin)
 
 
+def get_road_origin(position, context):
+    """
+    Calculates the lower corner of the road triangle, so that the car stands in the middle of the road.
+
+    Parameters:
+        position (np.array): The current coordinates of the car.
+        context (SimulationContext): The simulated scenario, providing the road width and incline.
+
+    Returns:
+        tuple: The x- and y-coordinate of the corner.
+
+    Formula:
+        - x1 = position[0] - (cos(turnIncline) * roadWidth / 2)
+        - y1 = position[1] - (sin(turnIncline) * roadWidth / 2)
+    """
+    triangleX = position[0] - (np.cos(np.radians(context.turnIncline)) * context.roadWidth / 2)
+    triangleY = position[1] - (np.sin(np.radians(context.turnIncline) * context.roadWidth / 2))
+    return triangleX, triangleY
+
+
 def add_road(plot, hypotenuse_length, angle_degrees, x1, y1):
     """
     Adds a triangle representing the road to the plot. The triangle is based on the hypotenuse (road width) and the
@@ -60,7 +81,29 @@ def add_road(plot, hypotenuse_length, angle_degrees, x1, y1):
         y1 (float): The starting y-coordinate of the triangle.
 
     Returns:
-        None
+        list: The lines of the adjacent side, the opposite side and the hypotenuse.
+    """
+    sides = get_road(hypotenuse_length, angle_degrees, x1, y1)
+
+    # plot the triangle
+    lines = []
+    for (xs, ys), label in zip(sides, ('Adjacent', 'Opposite', 'Hypotenuse')):
+        lines += plot.plot(xs, ys, '-', color='black', label=label)
+    return lines
+
+
+def get_road(hypotenuse_length, angle_degrees, x1, y1):
+    """
+    Calculates the sides of the triangle representing the road.
+
+    Parameters:
+        hypotenuse_length (float): The length of the hypotenuse (road width).
+        angle_degrees (float): The incline angle of the road in degrees.
+        x1 (float): The starting x-coordinate of the triangle.
+        y1 (float): The starting y-coordinate of the triangle.
+
+    Returns:
+        list: The x- and y-coordinates of the adjacent side, the opposite side and the hypotenuse.
 
     Formula:
         - adjacent = hypotenuse_length * cos(angle_degrees)
@@ -74,10 +117,9 @@ def add_road(plot, hypotenuse_length, angle_degrees, x1, y1):
     x2 = x1 + adjacent
     y2 = y1 + opposite
 
-    # plot the triangle
-    plot.plot([x1, x2], [y1, y1], '-', color='black', label='Adjacent')  # Adjacent side
-    plot.plot([x2, x2], [y1, y2], '-', color='black', label='Opposite')  # Opposite side
-    plot.plot([x1, x2], [y1, y2], '-', color='black', label='Hypotenuse')  # Hypotenuse
+    return [([x1, x2], [y1, y1]),  # Adjacent side
+            ([x2, x2], [y1, y2]),  # Opposite side
+            ([x1, x2], [y1, y2])]  # Hypotenuse
 
 
 def add_point(plot, origin):
@@ -86,7 +128,7 @@ def add_point(plot, origin):
 
     Parameters:
         plot (matplotlib.axes.Axes): The plot object to which the point will be added.
-        dataset (list): The simulation dataset, containing the current coordinates.
+        origin (list): The current coordinates of the car on the plane.
 
     Returns:
         None
@@ -105,26 +147,26 @@ def add_vectors(plot, dataset, origin):
 
     Parameters:
         plot (matplotlib.axes.Axes): The plot object to which the vectors will be added.
-        dataset (list): The simulation dataset, containing the vectors and the current angle.
+        dataset (Trajectory): The simulation step, containing the vectors and the current angle.
+        origin (list): The current coordinates of the car on the plane.
 
     Returns:
         None
 
     Formula:
-        - transform_vector(dataset[i], 0, radians(dataset[1] * -1), 0)
+        - transform_vector(vector, 0, radians(angle * -1), 0)
     """
     # rotate vectors to be shown correctly on a 2D plane
-    for i in range(2, 11):
-        dataset[i] = transform_vector(dataset[i], 0, np.radians(dataset[1] * -1), 0)
+    vectors = transform_vector(dataset.forces[0], 0, np.radians(dataset.angles[0] * -1), 0)
 
     # display vectors
-    plot.quiver(origin[0], origin[1], dataset[7][0], dataset[7][1], angles='xy', scale_units='xy', scale=6999,
+    plot.quiver(origin[0], origin[1], vectors[5][0], vectors[5][1], angles='xy', scale_units='xy', scale=6999,
                 color='purple', alpha=1)  # f_gravity_parallel
-    plot.quiver(origin[0], origin[1], dataset[8][0], dataset[8][1], angles='xy', scale_units='xy', scale=6999,
+    plot.quiver(origin[0], origin[1], vectors[6][0], vectors[6][1], angles='xy', scale_units='xy', scale=6999,
                 color='blue', alpha=1)  # f_static_friction
-    plot.quiver(origin[0], origin[1], dataset[9][0], dataset[9][1], angles='xy', scale_units='xy', scale=6999,
+    plot.quiver(origin[0], origin[1], vectors[7][0], vectors[7][1], angles='xy', scale_units='xy', scale=6999,
                 color='purple', alpha=1)  # f_neutral
-    plot.quiver(origin[0], origin[1], dataset[10][0], dataset[10][1], angles='xy', scale_units='xy', scale=6999,
+    plot.quiver(origin[0], origin[1], vectors[8][0], vectors[8][1], angles='xy', scale_units='xy', scale=6999,
                 color='yellow', alpha=1)  # f_road
-    plot.quiver(origin[0], origin[1], dataset[11][0], dataset[11][1], angles='xy', scale_units='xy',
+    plot.quiver(origin[0], origin[1], vectors[9][0], vectors[9][1], angles='xy', scale_units='xy',
                 scale=6999, color='purple', alpha=1)  # f_gravity
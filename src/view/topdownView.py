@@ -1,35 +1,47 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
-from model import variables
 
-
-def init_graph(plot, dataList, datasetNumber):
+def init_graph(plot, trajectory, datasetNumber, context):
     """
     Initializes the plot by adding the road and plotting simulation data such as car positions and force vectors.
 
     Parameters:
         plot (matplotlib.axes.Axes): The plot object where the graph will be drawn.
-        dataList (list): A list containing all the data (positions, forces) for the simulation.
-        datasetNumber (int): The index of the dataset from which to further extract simulation data.
+        trajectory (Trajectory): All the data (positions, forces) of the simulation.
+        datasetNumber (int): The index of the step from which to further extract simulation data.
+        context (SimulationContext): The simulated scenario, providing the curve and road dimensions.
+
+    Returns:
+        None
+    """
+    init_background(plot, trajectory, context)
+    add_vectors(plot, trajectory[datasetNumber])
+
+
+def init_background(plot, trajectory, context):
+    """
+    Draws everything of the top-down view that does not depend on the current step: the road, the axes and the car
+    positions.
+
+    Parameters:
+        plot (matplotlib.axes.Axes): The plot object where the graph will be drawn.
+        trajectory (Trajectory): All the data (positions, forces) of the simulation.
+        context (SimulationContext): The simulated scenario, providing the curve and road dimensions.
 
     Returns:
         None
     """
     # plot road
-    theta = np.linspace(0, 2 * np.pi * (variables.curveAngle / 360), variables.functionT)
-    add_road(variables.radius, theta)
+    theta = np.linspace(0, 2 * np.pi * (context.curveAngle / 360), context.functionT)
+    add_road(plot, context.radius, theta, context)
 
     # calculate the range of the axes
-    minX = None
-    maxX = None
-    minZ = None
-    maxZ = None
-    for i in theta:
-        minX = min((variables.radius + variables.roadWidth / 2) * np.cos(theta))
-        maxX = max((variables.radius + variables.roadWidth / 2) * np.sin(theta))
-        minZ = min((variables.radius + variables.roadWidth / 2) * np.sin(theta))
-        maxZ = max((variables.radius + variables.roadWidth / 2) * np.sin(theta))
+    outerX = (context.radius + context.roadWidth / 2) * np.cos(theta)
+    outerZ = (context.radius + context.roadWidth / 2) * np.sin(theta)
+    minX = outerX.min()
+    maxX = outerZ.max()
+    minZ = outerZ.min()
+    maxZ = outerZ.max()
 
     # initialize graph
     plot.set_xlim(-minX, maxX)
@@ -41,17 +53,18 @@ def init_graph(plot, dataList, datasetNumber):
     plot.autoscale(True)
 
     # add relevant simulation data
-    add_points(plot, dataList)
-    add_vectors(plot, dataList[datasetNumber])
+    add_points(plot, trajectory, context.renderPoints)
 
 
-def add_road(radius, theta):
+def add_road(plot, radius, theta, context):
     """
     Adds the road to the plot by calculating and plotting the inner, middle, and outer road borders.
 
     Parameters:
+        plot (matplotlib.axes.Axes): The plot object where the road will be drawn.
         radius (float): The radius of the curve, affecting the road's position.
         theta (numpy.ndarray): An array of angles used to calculate the x and z coordinates for the road borders.
+        context (SimulationContext): The simulated scenario, providing the road width.
 
     Returns:
         None
@@ -65,32 +78,41 @@ def add_road(radius, theta):
         - z3 = -1 * (radius + roadWidth / 2) * sin(theta)
     """
     # calculate road values
-    x1 = (radius - variables.roadWidth / 2) * np.cos(theta)  # inner road: x values
-    z1 = -1 * (radius - variables.roadWidth / 2) * np.sin(theta)  # inner road: z values
+    x1 = (radius - context.roadWidth / 2) * np.cos(theta)  # inner road: x values
+    z1 = -1 * (radius - context.roadWidth / 2) * np.sin(theta)  # inner road: z values
     x2 = radius * np.cos(theta)  # middle road: x values
     z2 = -1 * radius * np.sin(theta)  # middle road: z values
-    x3 = (radius + variables.roadWidth / 2) * np.cos(theta)  # outer road: x values
-    z3 = -1 * (radius + variables.roadWidth / 2) * np.sin(theta)  # outer road: z values
+    x3 = (radius + context.roadWidth / 2) * np.cos(theta)  # outer road: x values
+    z3 = -1 * (radius + context.roadWidth / 2) * np.sin(theta)  # outer road: z values
 
     # plot road
-    plt.plot(x1, z1, color='black', linestyle='-', label="Inner Road")  # inner road border
-    plt.plot(x2, z2, color='black', linestyle='--', label="Middle Road")  # middle of the road
-    plt.plot(x3, z3, color='black', linestyle='-', label="Outer Road")  # outer road border
+    plot.plot(x1, z1, color='black', linestyle='-', label="Inner Road")  # inner road border
+    plot.plot(x2, z2, color='black', linestyle='--', label="Middle Road")  # middle of the road
+    plot.plot(x3, z3, color='black', linestyle='-', label="Outer Road")  # outer road border
 
 
-def add_points(plot, dataList):
+def add_points(plot, trajectory, maxPoints=None):
     """
-    Adds all the car positions from the simulation to the plot.
+    Adds the car positions from the simulation to the plot as a single collection. Very long trajectories are thinned
+    out to evenly spaced positions (level of detail), so the rendering time does not grow with the number of steps.
 
     Parameters:
         plot (matplotlib.axes.Axes): The plot object where the car positions will be added.
-        dataList (list): A list of datasets containing the car's position and force at each time step.
+        trajectory (Trajectory): The simulation result containing the car's position at each time step.
+        maxPoints (int): The maximum number of positions to draw. If None, all positions are drawn.
 
     Returns:
         None
+
+    Formula:
+        - step = ceil(steps / maxPoints)
     """
-    for i in dataList:
-        plot.scatter(i[0][0], i[0][2], color='grey', marker='.', s=65)
+    positions = trajectory.positions
+    if maxPoints and len(positions) > maxPoints:
+        step = -(-len(positions) // maxPoints)
+        positions = np.concatenate((positions[:-1:step], positions[-1:]))  # always keep the end of the curve
+
+    plot.scatter(positions[:, 0], positions[:, 2], color='grey', marker='.', s=65)
 
 
 def add_vectors(plot, dataset):
@@ -99,22 +121,25 @@ def add_vectors(plot, dataset):
 
     Parameters:
         plot (matplotlib.axes.Axes): The plot object where the vectors will be drawn.
-        dataset (list): The dataset containing the position and forces at the current position.
+        dataset (Trajectory): The simulation step containing the position and forces at the current position.
 
     Returns:
         None
     """
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[2][0], dataset[2][2], angles='xy', scale_units='xy', scale=1,
+    position = dataset.positions[0]
+    vectors = dataset.forces[0]
+
+    plot.quiver(position[0], position[2], vectors[0][0], vectors[0][2], angles='xy', scale_units='xy', scale=1,
                 color='red')  # f_velocity
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[3][0], dataset[3][2], angles='xy', scale_units='xy', scale=1,
+    plot.quiver(position[0], position[2], vectors[1][0], vectors[1][2], angles='xy', scale_units='xy', scale=1,
                 color='red')  # f_new_velocity
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[4][0], dataset[4][2], angles='xy', scale_units='xy', scale=1,
+    plot.quiver(position[0], position[2], vectors[2][0], vectors[2][2], angles='xy', scale_units='xy', scale=1,
                 color='orange')  # f_drag
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[5][0], dataset[5][2], angles='xy', scale_units='xy', scale=1,
+    plot.quiver(position[0], position[2], vectors[3][0], vectors[3][2], angles='xy', scale_units='xy', scale=1,
                 color='green')  # f_centripetal
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[6][0], dataset[6][2], angles='xy', scale_units='xy', scale=1,
+    plot.quiver(position[0], position[2], vectors[4][0], vectors[4][2], angles='xy', scale_units='xy', scale=1,
                 color='green')  # f_centrifugal
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[7][0], dataset[7][2], angles='xy', scale_units='xy', scale=999,
+    plot.quiver(position[0], position[2], vectors[5][0], vectors[5][2], angles='xy', scale_units='xy', scale=999,
                 color='purple')  # f_gravity_parallel
-    plot.quiver(dataset[0][0], dataset[0][2], dataset[8][0], dataset[8][2], angles='xy', scale_units='xy', scale=999,
+    plot.quiver(position[0], position[2], vectors[6][0], vectors[6][2], angles='xy', scale_units='xy', scale=999,
                 color='blue')  # f_static_friction
@@ -0,0 +1,142 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from control.export import load_trajectory
+from view.animationView import TraversalAnimation, get_frame_step, FRAME_INTERVAL
+from view.wholeView import create_figure
+
+
+def export_video(trajectory, context, path, workers, directory=None):
+    """
+    Exports the traversal animation to a GIF or MP4 file. The frames are split into consecutive parts, which are
+    rendered on a pool of processes, each into its own off-screen figure. The frames are then stitched together in
+    order, with Pillow for GIF files and with ffmpeg for MP4 files.
+
+    Parameters:
+        trajectory (Trajectory): The simulation data for all iterations.
+        context (SimulationContext): The simulated scenario.
+        path (str): The video file to write, ending with .gif or .mp4.
+        workers (int): The number of worker processes.
+        directory (str): The directory the trajectory was saved to with `save_trajectory`, if any. The workers then
+            memory-map it instead of receiving a copy of the trajectory.
+
+    Returns:
+        None
+    """
+    frames = len(range(0, len(trajectory), get_frame_step(len(trajectory), context.animationFrames)))
+    parts = np.array_split(np.arange(frames), min(frames, workers * 4))
+    source = directory if directory is not None else trajectory
+    context = replace(context, trajectory=None)  # the workers only read the trajectory from source
+
+    print(f"Rendering {frames} frames...")
+
+    with tempfile.TemporaryDirectory() as frameDirectory:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            palette = not path.endswith(".mp4")  # GIF frames are reduced to a color palette by the workers already
+            for future in [executor.submit(render_frames, source, context, part, frameDirectory, palette)
+                           for part in parts]:
+                future.result()  # raises the errors of the workers
+
+        files = [get_frame_path(frameDirectory, frame) for frame in range(frames)]
+        if path.endswith(".mp4"):
+            write_mp4(files, path)
+        else:
+            write_gif(files, path)
+
+    print(f"Video written to {path}.")
+
+
+def render_frames(source, context, frames, frameDirectory, palette=False):
+    """
+    Renders a part of the frames of the traversal animation to PNG files. The static parts of the views are drawn once,
+    and every frame only redraws the changing artists on top of them. The PNG files are only compressed lightly, as
+    they are temporary.
+
+    Parameters:
+        source (Trajectory or str): The trajectory, or the directory it was saved to.
+        context (SimulationContext): The simulated scenario, without its trajectory.
+        frames (np.array): The indices of the frames to render.
+        frameDirectory (str): The directory the frames are written to.
+        palette (bool): Whether to reduce the frames to 256 colors, as needed for GIF files.
+
+    Returns:
+        None
+    """
+    if isinstance(source, str):
+        trajectory, _ = load_trajectory(source)
+    else:
+        trajectory = source
+
+    fig, ax1, ax2 = create_figure()
+    traversal = TraversalAnimation(ax1, ax2, trajectory, context)
+
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()  # draws everything but the animated artists
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    for frame in frames:
+        canvas.restore_region(background)
+        for artist in traversal.update(frame):
+            fig.draw_artist(artist)
+        image = Image.fromarray(np.asarray(canvas.buffer_rgba())[..., :3])
+        if palette:
+            image = image.quantize(method=Image.Quantize.FASTOCTREE)
+        image.save(get_frame_path(frameDirectory, frame), compress_level=1)
+
+
+def get_frame_path(frameDirectory, frame):
+    """
+    Returns the file of a rendered frame.
+
+    Parameters:
+        frameDirectory (str): The directory of the frames.
+        frame (int): The index of the frame.
+
+    Returns:
+        str: The path of the PNG file.
+    """
+    return os.path.join(frameDirectory, f"frame_{frame:06d}.png")
+
+
+def write_gif(files, path):
+    """
+    Stitches the frames to an endlessly looping GIF file. The frames are read one after another while writing.
+
+    Parameters:
+        files (list): The PNG files of the frames, in order.
+        path (str): The GIF file to write.
+
+    Returns:
+        None
+    """
+    first = Image.open(files[0])
+    first.save(path, save_all=True, append_images=(Image.open(file) for file in files[1:]), duration=FRAME_INTERVAL,
+               loop=0)
+
+
+def write_mp4(files, path):
+    """
+    Stitches the frames to an MP4 file with ffmpeg. Exits the program if ffmpeg is not installed.
+
+    Parameters:
+        files (list): The PNG files of the frames, in order.
+        path (str): The MP4 file to write.
+
+    Returns:
+        None
+    """
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg is required for MP4 files, but it is not installed. Use a .gif file instead.")
+        exit(-1)
+
+    pattern = os.path.join(os.path.dirname(files[0]), "frame_%06d.png")
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-framerate", str(1000 / FRAME_INTERVAL), "-i", pattern,
+                    "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", path], check=True)
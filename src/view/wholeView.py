@@ -1,30 +1,105 @@
-import matplotlib
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plot
+from matplotlib.figure import Figure
+
 from view import sideView
 from view import topdownView
 
 
-def init_views(dataList, datasetNumber):
+def init_views(trajectory, datasetNumber, context):
     """
     Initializes and displays the simulation views.
     This function creates a figure with two subplots. The first subplot displays
     a side view of the car's simulation at a specific dataset, and the second
     subplot provides a top-down view of the entire simulation path.
+    The interactive TkAgg backend is only loaded here, when a window is actually shown.
 
     Parameters:
-        dataList (list): A list containing simulation data for all iterations. Each
-            element in the list represents a dataset corresponding to a specific
-            point in the simulation.
-        datasetNumber (int): The index of the dataset within `dataList` that represents
+        trajectory (Trajectory): The simulation data for all iterations. Each
+            step of the trajectory corresponds to a specific point in the
+            simulation.
+        datasetNumber (int): The index of the step within `trajectory` that represents
             the specific moment of the simulation to be highlighted.
+        context (SimulationContext): The simulated scenario.
 
     Returns:
         None
     """
+    import matplotlib
+    matplotlib.use('TkAgg')
+    import matplotlib.pyplot as plot
+
     fig, (ax1, ax2) = plot.subplots(1, 2, figsize=(10, 5))  # 1 row, 2 columns
 
-    topdownView.init_graph(ax2, dataList, datasetNumber)  # plot top-down view on the second subplot
-    sideView.init_graph(ax1, dataList[datasetNumber])  # plot side view on the first subplot
+    draw_views(ax1, ax2, trajectory, datasetNumber, context)
 
     plot.show()  # show the combined figure
+
+
+def draw_views(ax1, ax2, trajectory, datasetNumber, context):
+    """
+    Draws the side view of one step and the top-down view of the whole trajectory onto two axes.
+
+    Parameters:
+        ax1 (matplotlib.axes.Axes): The axes of the side view.
+        ax2 (matplotlib.axes.Axes): The axes of the top-down view.
+        trajectory (Trajectory): The simulation data for all iterations.
+        datasetNumber (int): The index of the step to highlight.
+        context (SimulationContext): The simulated scenario.
+
+    Returns:
+        None
+    """
+    topdownView.init_graph(ax2, trajectory, datasetNumber, context)  # plot top-down view on the second subplot
+    sideView.init_graph(ax1, trajectory[datasetNumber], context)  # plot side view on the first subplot
+
+
+def create_figure():
+    """
+    Creates an off-screen figure with the two subplots of the views. It is not managed by pyplot, so no GUI backend is
+    loaded, and it can be reused for rendering many scenarios.
+
+    Returns:
+        tuple: The figure and the axes of the side view and of the top-down view.
+    """
+    fig = Figure(figsize=(10, 5))
+    ax1, ax2 = fig.subplots(1, 2)  # 1 row, 2 columns
+    return fig, ax1, ax2
+
+
+def render_views(trajectory, datasetNumber, context, path, figure=None):
+    """
+    Renders the simulation views without a window and writes them to an image file. The format follows the file
+    extension, e.g. .png or .svg.
+
+    Parameters:
+        trajectory (Trajectory): The simulation data for all iterations.
+        datasetNumber (int): The index of the step to highlight.
+        context (SimulationContext): The simulated scenario.
+        path (str): The image file to write.
+        figure (tuple): A figure and its axes from `create_figure` to reuse. If None, a new figure is created.
+
+    Returns:
+        None
+    """
+    fig, ax1, ax2 = figure if figure is not None else create_figure()
+
+    for ax in (ax1, ax2):
+        ax.clear()
+    draw_views(ax1, ax2, trajectory, datasetNumber, context)
+
+    fig.savefig(path)
+    print(f"Views written to {path}.")
+
+
+def render_batch(scenarios):
+    """
+    Renders the views of many scenarios into image files, reusing one figure for all of them.
+
+    Parameters:
+        scenarios (iterable): Tuples of (trajectory, datasetNumber, context, path), see `render_views`.
+
+    Returns:
+        None
+    """
+    figure = create_figure()
+    for trajectory, datasetNumber, context, path in scenarios:
+        render_views(trajectory, datasetNumber, context, path, figure)